@@ -1,2 +1,3 @@
-py pylos_2.py client Julien > test.txt
+rem Pylos_bon.py needs Python 3.8 or later
+py Pylos_bon.py client Julien > test.txt
 pause > nul
\ No newline at end of file
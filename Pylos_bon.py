@@ -4,17 +4,21 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+import os
 import socket
 import sys
 import json
-import copy
 import json
 
-from tree import Tree
+import bitboard
+import book
+import evaluation
+import geometry
+import player
+import tablebase
 from lib import game
 
 
-
 class PylosState(game.GameState):
     '''Class representing a state for the Pylos game.'''
 
@@ -41,68 +45,64 @@ class PylosState(game.GameState):
 
         super().__init__(initialstate)
 
+    def encode(self):
+        """Compact encoding of the state (see bitboard.encodestate)"""
+        state = self._state['visible']
+        boards = [0, 0]
+        for i in range(len(geometry.CELLS)):
+            value = self._cell(i)
+            if value is not None:
+                boards[value] |= 1 << i
+        return bitboard.encodestate(boards, state['reserve'], state['turn'])
+
+    @classmethod
+    def decode(cls, data):
+        if data.startswith('{'):
+            return cls.parse(data)
+        return cls(bitboard.PylosState.unpack(bitboard.decodestate(data)).visible())
+
     def get(self, layer, row, column):
         """Checks if the position (layer,row,column) is on the board"""
-        if layer < 0 or row < 0 or column < 0:
-            raise game.InvalidMoveException('The position ({}) is outside of the board'.format([layer, row, column]))
-        try:
-            return self._state['visible']['board'][layer][row][column]
-        except:
+        if (layer, row, column) not in geometry.INDEX:
             raise game.InvalidMoveException('The position ({}) is outside of the board'.format([layer, row, column]))
+        return self._state['visible']['board'][layer][row][column]
 
     def safeGet(self, layer, row, column):
-        try:
-            return self.get(layer, row, column)
-        except game.InvalidMoveException:
+        if (layer, row, column) not in geometry.INDEX:
             return None
+        return self._state['visible']['board'][layer][row][column]
+
+    def _cell(self, i):
+        """Value of the cell number i of the geometry tables"""
+        layer, row, column = geometry.CELLS[i]
+        return self._state['visible']['board'][layer][row][column]
 
     def validPosition(self, layer, row, column):
         """Checks if the position is free and stable"""
         if self.get(layer, row, column) != None:
             raise game.InvalidMoveException('The position ({}) is not free'.format([layer, row, column]))
 
-        if layer > 0:
-            if (
-                self.get(layer - 1, row, column) is None or
-                self.get(layer - 1, row + 1, column) is None or
-                self.get(layer - 1, row + 1, column + 1) is None or
-                self.get(layer - 1, row, column + 1) is None
-            ):
+        for i in geometry.SUPPORTS[geometry.INDEX[(layer, row, column)]]:
+            if self._cell(i) is None:
                 raise game.InvalidMoveException('The position ({}) is not stable'.format([layer, row, column]))
 
     def canMove(self, layer, row, column):
         if self.get(layer, row, column) is None:
             raise game.InvalidMoveException('The position ({}) is empty'.format([layer, row, column]))
 
-        if layer < 3:
-            if (
-                self.safeGet(layer + 1, row, column) is not None or
-                self.safeGet(layer + 1, row - 1, column) is not None or
-                self.safeGet(layer + 1, row - 1, column - 1) is not None or
-                self.safeGet(layer + 1, row, column - 1) is not None
-            ):
+        for i in geometry.COVERS[geometry.INDEX[(layer, row, column)]]:
+            if self._cell(i) is not None:
                 raise game.InvalidMoveException('The position ({}) is not movable'.format([layer, row, column]))
 
     def createSquare(self, coord):
-        layer, row, column = tuple(coord)
-
-        def isSquare(layer, row, column):
-            if (
-                self.safeGet(layer, row, column) != None and
-                self.safeGet(layer, row + 1, column) == self.safeGet(layer, row, column) and
-                self.safeGet(layer, row + 1, column + 1) == self.safeGet(layer, row, column) and
-                self.safeGet(layer, row, column + 1) == self.safeGet(layer, row, column)
-            ):
-                return True
+        """Checks if the ball at 'coord' belongs to a square of four balls of the same colour"""
+        index = geometry.INDEX.get(tuple(coord))
+        if index is None:
             return False
-
-        if (
-            isSquare(layer, row, column) or
-            isSquare(layer, row - 1, column) or
-            isSquare(layer, row - 1, column - 1) or
-            isSquare(layer, row, column - 1)
-        ):
-            return True
+        for square in geometry.SQUARES[index]:
+            values = [self._cell(i) for i in square]
+            if values[0] is not None and values.count(values[0]) == 4:
+                return True
         return False
 
     def set(self, coord, value):
@@ -120,7 +120,19 @@ class PylosState(game.GameState):
         self._state['visible']['board'][layer][row][column] = None
 
     def update(self, move, player):
-        """update the state with the move and raise game.InvalidMoveException"""
+        """update the state with the move and raise game.InvalidMoveException, leaving the state unchanged"""
+        state = self._state['visible']
+        # An invalid removal is only seen once the ball is placed or moved: the board and reserves are restored so that
+        # the clients keeping their state up to date with the moves (DELTA option) stay in sync
+        board = [[row[:] for row in layer] for layer in state['board']]
+        reserve = state['reserve'][:]
+        try:
+            self._update(move, player)
+        except game.InvalidMoveException:
+            state['board'], state['reserve'] = board, reserve
+            raise
+
+    def _update(self, move, player):
         state = self._state['visible']
         if move['move'] == 'place':
             if state['reserve'][player] < 1:
@@ -149,6 +161,13 @@ class PylosState(game.GameState):
                 state['reserve'][player] += 1
         state['turn'] = (state['turn'] + 1) % 2
 
+    def applymove(self, move):
+        """Plays the JSON move 'move' for the player to play"""
+        try:
+            self.update(json.loads(move), self._state['visible']['turn'])
+        except json.JSONDecodeError:
+            raise game.InvalidMoveException('move must be valid JSON string: {}'.format(move))
+
     def winner(self):
         """return 0 or 1 if a winner, return None if draw, return -1 if game continue"""
         state = self._state['visible']
@@ -187,8 +206,8 @@ class PylosState(game.GameState):
 class PylosServer(game.GameServer):
     '''Class representing a server for the Pylos game.'''
 
-    def __init__(self, verbose=False):
-        super().__init__('Pylos', 2, PylosState(), verbose=verbose)
+    def __init__(self, verbose=False, log=None):
+        super().__init__('Pylos', 2, PylosState(), verbose=verbose, log=log)
 
     def applymove(self, move):
         try:
@@ -200,307 +219,21 @@ class PylosServer(game.GameServer):
 class PylosClient(game.GameClient):
     '''Class representing a client for the Pylos game.'''
 
-    def __init__(self, name, server, verbose=False):
-        self.deltas = []
-        self.firstmoves = []
-        super().__init__(server, PylosState, verbose=verbose)
+    def __init__(self, name, server, verbose=False, hashsize=16, budget=player.BUDGET, strategy='alphabeta',
+                 workers=1, iterations=None, rollouts=1, tablebase=None, book=None, evaluate=None, log=None,
+                 framed=True, compact=True, delta=True):
+        self.player = player.Player(hashsize, budget, strategy, workers, iterations, rollouts, tablebase, book,
+                                    evaluate)
+        try:
+            super().__init__(server, bitboard.PylosState, verbose=verbose, log=log, framed=framed,
+                             compact=compact, delta=delta, name='Pylos', nbplayers=2)
+        finally:
+            self.player.close()
         self.__name = name
 
     def _handle(self, message):
         pass
 
-    def allplacement(self, test_pylos):
-        """Function that returns a list of "move" dictionaries. Contains all the possible ways to place a ball from the
-        reserve. Also take into acount the case when a square is made and one or two balls are being removed."""
-        placements = []
-        player = test_pylos._state['visible']['turn']
-        for layer in range(4):
-            for row in range(4-layer):
-                for column in range(4-layer):
-                    value = test_pylos.get(layer,row,column)
-                    if value is None:
-                        try:
-                            test_pylos.validPosition(layer, row, column)
-                        except game.InvalidMoveException:
-                            pass
-                        else:
-                            if test_pylos.createSquare((layer, row, column)) is True:
-                                if player == 0:
-                                    removableballs = self.removableballs0(test_pylos)
-                                    removableballs.apppend([layer, row, column])
-                                else:
-                                    removableballs = self.removableballs1(test_pylos)
-                                    removableballs.apppend([layer, row, column])
-                                for i in removableballs:
-                                    if i[0] == layer - 1 and i[1] == row and i[2] == column:
-                                        removableballs.remove(i)
-                                    elif i[0] == layer - 1 and i[1] == row + 1 and i[2] == column:
-                                        removableballs.remove(i)
-                                    elif i[0] == layer - 1 and i[1] == row + 1 and i[2] == column + 1:
-                                        removableballs.remove(i)
-                                    elif i[0] == layer - 1 and i[1] == row and i[2] == column + 1:
-                                        removableballs.remove(i)
-
-                                for i in removableballs:
-                                    move = {
-                                        'move': 'place',
-                                        'to': [layer, row, column],
-                                        'remove': i
-                                    }
-
-                                    placements.append(move)
-                            else:
-                                move = {
-                                    'move': 'place',
-                                    'to': [layer, row, column]
-                                }
-                                placements.append(move)
-        return placements
-
-    def holes(self, test_pylos):
-        """Function returning a list of lists [layer, row, column] for all the valid holes of the board"""
-        availableholes = []
-        for layer in range(1, 4):
-            for row in range(4 - layer):
-                for column in range(4 - layer):
-                    value = test_pylos.get(layer, row, column)
-                    if value is None:
-                        try:
-                            test_pylos.validPosition(layer, row, column)
-                            hole = [layer, row, column]
-                        except game.InvalidMoveException:
-                            pass
-                        else:
-                            availableholes.append(hole)
-        return availableholes
-
-    def removableballs0(self, test_pylos):
-        """Function returning a list of lists [layer, row, column] for all the removable balls of the board for player 0"""
-        removableballs=[]
-        for layer in range(4):
-            for row in range(4 - layer):
-                for column in range(4 - layer):
-                    value = test_pylos.get(layer, row, column)
-                    if value == 0:
-                        try:
-                            test_pylos.canMove(layer, row, column)
-                        except game.InvalidMoveException:
-                            pass
-                        else:
-                            coord = [layer, row, column]
-                            removableballs.append(coord)
-        return removableballs
-
-    def removableballs1(self, test_pylos):
-        """Function returning a list of lists [layer, row, column] for all the removable balls of the board for
-        player 1"""
-        removableballs=[]
-        for layer in range(4):
-            for row in range(4 - layer):
-                for column in range(4 - layer):
-                    value = test_pylos.get(layer, row, column)
-                    if value == 1:
-                        try:
-                            test_pylos.canMove(layer, row, column)
-                        except game.InvalidMoveException :
-                            pass
-                        else:
-                            coord = [layer, row, column]
-                            removableballs.append(coord)
-        return removableballs
-
-    def moveup(self, test_pylos):
-        """Function returning a list of all the possible dictionaries "move" for moving up a ball, including the case
-        when a square is formed and one or two balls are being removed. Two parts : one for player 0 and one for
-        player 1"""
-        possibilities = []
-        if test_pylos._state['visible']['turn'] is 0:
-            for layer in range(4):
-                for row in range(4 - layer):
-                    for column in range(4 - layer):
-                        value = test_pylos.get(layer, row, column)
-                        if value is 0:
-                            try:
-                                test_pylos.canMove(layer, row,column)
-                            except game.InvalidMoveException:
-                                pass
-                            # When we know which ball is moving, we can remove some possibilities from the
-                            # availableholes list
-                            availableholes = self.holes(test_pylos)
-                            for i in availableholes:
-                                if i[0] <= layer:
-                                    availableholes.remove(i)
-                                elif i[0] == layer + 1 and i[1] == row and i[2] == column:
-                                    availableholes.remove(i)
-                                elif i[0] == layer + 1 and i[1] == row + 1 and i[0] == column:
-                                    availableholes.remove(i)
-                                elif i[0] == layer + 1 and i[1] == row + 1 and i[0] == column + 1:
-                                    availableholes.remove(i)
-                                elif i[0] == layer + 1 and i[1] == row and i[0] == column + 1:
-                                    availableholes.remove(i)
-
-                            for i in availableholes:
-                                move = {
-                                    'move': 'move',
-                                    'from': [layer, row, column],
-                                    'to': i
-                                }
-                                possibilities.append(move)
-
-                            if test_pylos.createSquare((layer, row, column)) is True:
-                                removableballs0 = self.removableballs0(test_pylos)
-                                for i in removableballs0:
-                                    if i[0] == layer - 1 and i[1] == row and i[2] == column:
-                                        removableballs0.remove(i)
-                                    elif i[0] == layer - 1 and i[1] == row + 1 and i[2] == column:
-                                        removableballs0.remove(i)
-                                    elif i[0] == layer - 1 and i[1] == row + 1 and i[2] == column + 1:
-                                        removableballs0.remove(i)
-                                    elif i[0] == layer - 1 and i[1] == row and i[2] == column + 1:
-                                        removableballs0.remove(i)
-                                    elif i[0] == layer and i[1] == row and i[2] == column:
-                                        removableballs0.remove(i)
-                                    removableballs0.append(i)
-                                removableballs01 = copy.deepcopy(removableballs0)
-                                for i in removableballs0:
-                                    for j in removableballs01:
-                                        if i != j:
-                                            removewhat = []
-                                            removewhat.append([i, j])
-                                            move['remove'] = removewhat
-                                        else:
-                                            pass
-                                possibilities.append(move)
-
-        else:
-            for layer in range(4):
-                for row in range(4 - layer):
-                    for column in range(4 - layer):
-                        value = test_pylos.get(layer, row, column)
-                        if value is 1:
-                            try:
-                                test_pylos.canMove(layer, row, column)
-                            except game.InvalidMoveException:
-                                pass
-                            availableholes = self.holes(test_pylos)
-                            for i in availableholes:
-                                if i[0] <= layer:
-                                    availableholes.remove(i)
-                                elif i[0] == layer + 1 and i[1] == row and i[2] == column:
-                                    availableholes.remove(i)
-                                elif i[0] == layer + 1 and i[1] == row + 1 and i[0] == column:
-                                    availableholes.remove(i)
-                                elif i[0] == layer + 1 and i[1] == row + 1 and i[0] == column + 1:
-                                    availableholes.remove(i)
-                                elif i[0] == layer + 1 and i[1] == row and i[0] == column + 1:
-                                    availableholes.remove(i)
-
-                            for i in availableholes:
-                                move = {
-                                    'move': 'move',
-                                    'from': [layer, row, column],
-                                    'to': i
-                                }
-                            if test_pylos.createSquare((layer, row, column)) is True:
-                                removableballs1 = self.removableballs1(test_pylos)
-                                for i in removableballs1:
-                                    if i[0] == layer - 1 and i[1] == row and i[2] == column:
-                                        removableballs1.remove(i)
-                                    elif i[0] == layer - 1 and i[1] == row + 1 and i[2] == column:
-                                        removableballs1.remove(i)
-                                    elif i[0] == layer - 1 and i[1] == row + 1 and i[2] == column + 1:
-                                        removableballs1.remove(i)
-                                    elif i[0] == layer - 1 and i[1] == row and i[2] == column + 1:
-                                        removableballs1.remove(i)
-                                    elif i[0] == layer and i[1] == row and i[2] == column:
-                                        removableballs1.remove(i)
-                                    removableballs1.append(i)
-                                removableballs11 = copy.deepcopy(removableballs1)
-                                for i in removableballs1:
-                                    for j in removableballs11:
-                                        if i != j:
-                                            removewhat = []
-                                            removewhat.append([i, j])
-                                            move['remove'] = removewhat
-                                        else:
-                                            pass
-                                possibilities.append(move)
-        return possibilities
-
-
-    def delta_func(self, st):
-        """Function calculating the delta of the two players reserves. It also adds a key "number" to the "state"
-        dictionary for attributing a number to each of the children of the first iteration. Returning the number
-        and de delta."""
-        res0 = st._state['visible']['reserve'][0]
-        res1 = st._state['visible']['reserve'][1]
-        number = st._state['visible']['number']
-        if st._state['visible']['turn'] is 0:
-            delta = res0-res1
-        else:
-            delta = res1-res0
-        return number, delta
-
-    def firstmoves_func(self, movements):
-        """Function returning a list of all the possible movements (place or move up)"""
-
-        self.firstmoves = []
-        self.firstmoves.append(movements)
-        return self.firstmoves
-
-    def tree(self, st, iter):
-        """Function that increses the 'number' value for each child of the first iteration. For the further iterations,
-        the 'number' values correspond to the one of the parent."""
-        player = st._state['visible']['turn']
-        number = st._state['visible']['number']
-        #state = Pylos_copy._state['visible']
-        placements = self.allplacement(st)
-        upmoves = self.moveup(st)
-        movements = placements + upmoves
-        if iter is 3:
-            self.firstmoves_func(movements)
-        children = []
-        if iter < 1:
-            return Tree(st._state['visible'])
-        self.deltas = []
-        if iter == 3:
-            iter -= 1
-            for movement in movements:
-                Pylos_copy = copy.deepcopy(st)
-                number += 1
-                Pylos_copy.update(movement, player)
-                Pylos_copy._state['visible']['number'] = number
-                self.deltas.append(self.delta_func(Pylos_copy))
-    #            max_indice = [number for number, delta in self.deltas if delta == max(self.deltas[1])]
-    #            Pylos_copy.set(movement['to'],player)
-                child = self.tree(Pylos_copy, iter)
-                children.append(child)
-        else:
-            iter -= 1
-            for movement in movements:
-                Pylos_copy = copy.deepcopy(st)
-                Pylos_copy.update(movement, player)
-                Pylos_copy._state['visible']['number'] = number
-                self.deltas.append(self.delta_func(Pylos_copy))
-     #           max_indice = [number for number, delta in self.deltas if delta == max(self.deltas[1])]
-                #            Pylos_copy.set(movement['to'],player)
-                child = self.tree(Pylos_copy, iter)
-                children.append(child)
-        return Tree(st._state['visible'], children)
-
-    def mostfrequent(self, L):
-        """Returns the most frequent element of the list"""
-        L.sort()
-        n0, e0 = 0, None
-        ep = None
-        for e in L:
-            if e != ep:
-                n = L.count(e)
-                if n > n0:
-                    n0, e0 = n, e
-                ep = e
-        return e0, n0
-
     def _nextmove(self, state):
         '''
         Returning move as a string
@@ -529,37 +262,7 @@ class PylosClient(game.GameClient):
 
         return it in JSON
         '''
-
-#        if state._state['visible']['reserve'][0] == 15:
-#            pylosCopy = PylosState()
-#            pylosCopy._state['visible']['number'] = -1
-#            print(self.tree(pylosCopy, 3))
-#            print(self.firstmoves[0][0])
-        print('coucou')
-        if state._state['visible']['turn'] == 1:
-            print('if ok')
-            pylosCopy = copy.deepcopy(state)
-            pylosCopy._state['visible']['number'] = -1
-            print(self.tree(pylosCopy, 3))
-            for i in range(len(self.deltas)):
-                print('for ok')
-                max_indice = [number for number, delta in self.deltas if delta == max(self.deltas[i])]
-            e, n = self.mostfrequent(max_indice)
-            print(self.firstmoves[0][0])
-            return json.dumps(self.firstmoves[0][0])
-            #indice = self.deltas[0]
-            #print(self.firstmoves[0][0])
-
-        if state._state['visible']['turn'] == 0:
-            for layer in range(4):
-                for row in range(4 - layer):
-                    for column in range(4 - layer):
-                        if state.get(layer, row, column) == None:
-                            return json.dumps({
-                                'move': 'place',
-                                'to': [layer, row, column]
-                            })
-
+        return json.dumps(self.player.nextmove(state))
 
 
 if __name__ == '__main__':
@@ -571,15 +274,52 @@ if __name__ == '__main__':
     server_parser.add_argument('--host', help='hostname (default: localhost)', default='localhost')
     server_parser.add_argument('--port', help='port to listen on (default: 5000)', default=5000)
     server_parser.add_argument('--verbose', action='store_true')
+    server_parser.add_argument('--log', help='file to append the moves of the game to (see records.py)')
+    server_parser.add_argument('--concurrent', help='play any number of games at the same time, pairing the '
+                                                    'clients by order of arrival', action='store_true')
+    server_parser.add_argument('--games', help='with --concurrent, stop after this number of games', type=int)
     # Create the parser for the 'client' subcommand
     client_parser = subparsers.add_parser('client', help='launch a client')
     client_parser.add_argument('name', help='name of the player')
     client_parser.add_argument('--host', help='hostname of the server (default: localhost)', default='127.0.0.1')
     client_parser.add_argument('--port', help='port of the server (default: 5000)', default=5000)
     client_parser.add_argument('--verbose', action='store_true')
+    client_parser.add_argument('--log', help='file to append the moves of the player to (see records.py)')
+    client_parser.add_argument('--unframed', help='do not ask the server for framed messages', action='store_true')
+    client_parser.add_argument('--json', help='do not ask the server for compact states', action='store_true')
+    client_parser.add_argument('--full-states', help='ask the server for the whole state on every turn rather than '
+                                                     'the moves played since the last one', action='store_true')
+    client_parser.add_argument('--hash', help='size of the transposition table in MB (default: 16)',
+                               type=int, default=16)
+    client_parser.add_argument('--time', help='time budget per move in seconds (default: {})'.format(player.BUDGET),
+                               type=float, default=player.BUDGET)
+    client_parser.add_argument('--search', help='search backend: alphabeta (single process), root (root moves '
+                                                 'split over the workers), smp (workers sharing a transposition '
+                                                 'table) or mcts (Monte Carlo tree search) (default: alphabeta)',
+                               choices=player.STRATEGIES, default='alphabeta')
+    client_parser.add_argument('--workers', help='number of processes of the root and smp backends (default: {})'
+                                                 .format(os.cpu_count()), type=int, default=os.cpu_count())
+    client_parser.add_argument('--iterations', help='number of playouts per move of the mcts backend, instead of '
+                                                    'the time budget', type=int)
+    client_parser.add_argument('--rollouts', help='number of playouts per iteration of the mcts backend, simulated '
+                                                  'together with NumPy when above 1 (default: 1)', type=int, default=1)
+    client_parser.add_argument('--tablebase', help='endgame tablebase file written by tablebase.py')
+    client_parser.add_argument('--book', help='opening book file written by book.py')
+    client_parser.add_argument('--weights', help='JSON file of evaluation weights {{feature: weight}} (features: {})'
+                                                 .format(', '.join(evaluation.FEATURES)))
     # Parse the arguments of sys.args
     args = parser.parse_args()
     if args.component == 'server':
-        PylosServer(verbose=args.verbose).run()
+        if args.concurrent:
+            game.GameHost(PylosServer, int(args.port), verbose=args.verbose, log=args.log, maxgames=args.games).run()
+        else:
+            PylosServer(verbose=args.verbose, log=args.log).run()
     else:
-        PylosClient(args.name, (args.host, args.port), verbose=args.verbose)
\ No newline at end of file
+        PylosClient(args.name, (args.host, args.port), verbose=args.verbose, hashsize=args.hash,
+                    budget=args.time, strategy=args.search,
+                    workers=args.workers, iterations=args.iterations,
+                    rollouts=args.rollouts,
+                    tablebase=tablebase.Tablebase(args.tablebase) if args.tablebase else None,
+                    book=book.OpeningBook(args.book) if args.book else None,
+                    evaluate=evaluation.Evaluation.load(args.weights) if args.weights else None, log=args.log,
+                    framed=not args.unframed, compact=not args.json, delta=not args.full_states)
\ No newline at end of file
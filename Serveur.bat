@@ -1,2 +1,3 @@
-py pylos_2.py server --verbose
+rem Pylos_bon.py needs Python 3.8 or later
+py Pylos_bon.py server --verbose
 pause > nul
\ No newline at end of file
@@ -0,0 +1,145 @@
+# arena.py
+# Author: Elise Raxhon & Julien Beard
+# Version: October 18, 2026
+# -*- coding: utf-8 -*-
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import random
+import time
+
+import bitboard
+import book
+import evaluation
+from geometry import MAXMOVES
+import player
+import tablebase
+from lib import game
+
+# Random moves played at the start of each game so that deterministic players do not always play the same game
+OPENING = 2
+
+
+def parsespec(spec):
+    """Parses a player description 'strategy[:option=value,...]' into the arguments of player.Player.
+    Options: time, hash, workers, iterations, rollouts, weights (JSON file), book and tablebase (files)."""
+    strategy, _, options = spec.partition(':')
+    if strategy not in player.STRATEGIES:
+        raise ValueError('unknown strategy: {}'.format(strategy))
+    arguments = {'strategy': strategy}
+    converters = {'time': ('budget', float), 'hash': ('hashsize', int), 'workers': ('workers', int),
+                  'iterations': ('iterations', int), 'rollouts': ('rollouts', int), 'weights': ('weights', str),
+                  'book': ('book', str), 'tablebase': ('tablebase', str)}
+    for option in filter(None, options.split(',')):
+        name, _, value = option.partition('=')
+        if name not in converters:
+            raise ValueError('unknown option: {}'.format(name))
+        key, convert = converters[name]
+        arguments[key] = convert(value)
+    return arguments
+
+
+def makeplayer(arguments):
+    """Builds a player.Player from the result of parsespec, opening its files"""
+    arguments = dict(arguments)
+    weights = arguments.pop('weights', None)
+    if weights is not None:
+        arguments['evaluate'] = evaluation.Evaluation.load(weights)
+    if 'book' in arguments:
+        arguments['book'] = book.OpeningBook(arguments['book'])
+    if 'tablebase' in arguments:
+        arguments['tablebase'] = tablebase.Tablebase(arguments['tablebase'])
+    return player.Player(**arguments)
+
+
+def playgame(players, opening=OPENING, seed=None, maxmoves=MAXMOVES):
+    """Plays a game between two player.Player (players[0] is Light) and returns (winner or None for a draw,
+    [thinking time of each player], [number of moves of each player]). A player whose move is invalid or who cannot
+    play loses. Only the moves after the 'opening' random ones are timed."""
+    rand = random.Random(seed)
+    state = bitboard.PylosState()
+    elapsed = [0.0, 0.0]
+    moves = [0, 0]
+    for number in range(maxmoves):
+        winner = state.winner()
+        if winner != -1:
+            return winner, elapsed, moves
+        current = state.turn
+        legal = list(state.legal_moves())
+        if not legal:
+            return 1 - current, elapsed, moves
+        if number < opening:
+            move = rand.choice(legal)
+        else:
+            start = time.monotonic()
+            move = players[current].nextmove(state.copy())
+            elapsed[current] += time.monotonic() - start
+            moves[current] += 1
+        try:
+            state.update(move, current)
+        except game.InvalidMoveException:
+            return 1 - current, elapsed, moves
+    return None, elapsed, moves
+
+
+def _match(specs, swap, opening, seed):
+    """Plays one game in a worker process, 'specs' playing Light then Dark unless 'swap'. Returns (winner as an
+    index in 'specs' or None, [thinking time], [number of moves]), both indexed as 'specs'."""
+    players = [makeplayer(spec) for spec in (specs[::-1] if swap else specs)]
+    try:
+        winner, elapsed, moves = playgame(players, opening, seed)
+    finally:
+        for current in players:
+            current.close()
+    if swap:
+        elapsed, moves = elapsed[::-1], moves[::-1]
+        winner = None if winner is None else 1 - winner
+    return winner, elapsed, moves
+
+
+def tournament(specs, games, workers=1, opening=OPENING, seed=0):
+    """Plays 'games' games between the two players described by 'specs' (see parsespec), alternating colours, over
+    'workers' processes. Returns ([wins of each player], draws, [thinking time], [number of moves])."""
+    wins = [0, 0]
+    draws = 0
+    elapsed = [0.0, 0.0]
+    moves = [0, 0]
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(_match, specs, number % 2 == 1, opening, seed + number) for number in range(games)]
+        for future in futures:
+            winner, times, counts = future.result()
+            if winner is None:
+                draws += 1
+            else:
+                wins[winner] += 1
+            for side in (0, 1):
+                elapsed[side] += times[side]
+                moves[side] += counts[side]
+    return wins, draws, elapsed, moves
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Plays Pylos games between two players without server')
+    parser.add_argument('first', help='first player: strategy[:option=value,...] with strategy in {} and options '
+                                      'time, hash, workers, iterations, rollouts, weights, book, tablebase '
+                                      '(example: alphabeta:time=0.1,weights=weights.json)'.format(player.STRATEGIES))
+    parser.add_argument('second', help='second player, same format')
+    parser.add_argument('--games', help='number of games, colours alternate (default: 10)', type=int, default=10)
+    parser.add_argument('--workers', help='number of games played at the same time (default: 1)', type=int,
+                        default=1)
+    parser.add_argument('--opening', help='number of random moves at the start of each game (default: {})'
+                                          .format(OPENING), type=int, default=OPENING)
+    parser.add_argument('--seed', help='seed of the random openings (default: 0)', type=int, default=0)
+    args = parser.parse_args()
+    try:
+        specs = [parsespec(args.first), parsespec(args.second)]
+    except ValueError as e:
+        parser.error(str(e))
+    start = time.monotonic()
+    wins, draws, elapsed, moves = tournament(specs, args.games, args.workers, args.opening, args.seed)
+    duration = time.monotonic() - start
+    for side, name in enumerate((args.first, args.second)):
+        print('{}: {} wins ({:.1%}), {:.3f} s per move'.format(name, wins[side], wins[side] / args.games,
+                                                              elapsed[side] / max(moves[side], 1)))
+    print('Draws: {}'.format(draws))
+    print('{} games in {:.1f} s ({:.0f} games per hour)'.format(args.games, duration, args.games * 3600 / duration))
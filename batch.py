@@ -0,0 +1,169 @@
+# batch.py
+# Author: Elise Raxhon & Julien Beard
+# Version: October 18, 2026
+# -*- coding: utf-8 -*-
+
+import argparse
+import time
+
+import numpy as np
+
+import geometry
+from geometry import CELLS, SUPPORTS, COVERS, MAXMOVES
+
+EMPTY = -1
+
+NCELLS = len(CELLS)
+LAYER = np.array(geometry.LAYER, dtype=np.int8)
+# Supports and covers padded to four cells with index NCELLS, a virtual cell always occupied for the
+# supports and always empty for the covers
+_SUPPORTS = np.array([list(cells) + [NCELLS] * (4 - len(cells)) for cells in SUPPORTS], dtype=np.intp)
+_COVERS = np.array([list(cells) + [NCELLS] * (4 - len(cells)) for cells in COVERS], dtype=np.intp)
+# The distinct squares of the pyramid and, for each cell, the squares it belongs to
+_SQUARES = np.array(geometry.DISTINCT_SQUARES, dtype=np.intp)
+_CELLSQUARES = np.zeros((NCELLS, len(_SQUARES)), dtype=bool)
+for _i, _square in enumerate(_SQUARES):
+    _CELLSQUARES[_square, _i] = True
+# _UP[s, t]: a ball at s can move up to t (upper layer and not resting on s)
+_UP = (LAYER[None, :] > LAYER[:, None])
+for _t, _cells in enumerate(SUPPORTS):
+    _UP[list(_cells), _t] = False
+
+
+def occupied(board):
+    return board != EMPTY
+
+
+def free(board):
+    """N x 30 mask of the cells where a ball can be put (empty and supported)"""
+    padded = np.concatenate([occupied(board), np.ones((len(board), 1), dtype=bool)], axis=1)
+    return ~padded[:, :NCELLS] & padded[:, _SUPPORTS].all(axis=2)
+
+
+def movable(board, player):
+    """N x 30 mask of the balls of 'player' (one per game) with nothing resting on them"""
+    padded = np.concatenate([occupied(board), np.zeros((len(board), 1), dtype=bool)], axis=1)
+    return (board == player[:, None]) & ~padded[:, _COVERS].any(axis=2)
+
+
+def placements(board, reserve, player):
+    """N x 30 mask of the legal placements of 'player'"""
+    return free(board) & (reserve[np.arange(len(board)), player] > 0)[:, None]
+
+
+def moveups(board, player):
+    """N x 30 x 30 mask of the legal moves of 'player' from a cell (second axis) to an upper one (third axis)"""
+    return (movable(board, player) & (LAYER < 3))[:, :, None] & free(board)[:, None, :] & _UP[None, :, :]
+
+
+def squares(board, player):
+    """N x 14 mask of the squares made of four balls of 'player'"""
+    return (board[:, _SQUARES] == player[:, None, None]).all(axis=2)
+
+
+def _pick(mask, rng):
+    """Index of a random True cell of each row of 'mask' (rows without any return -1)"""
+    scores = rng.random(mask.shape) * mask
+    choice = scores.argmax(axis=1)
+    choice[~mask.any(axis=1)] = -1
+    return choice
+
+
+class Batch:
+    '''Many Pylos games played at once: boards (N x 30, -1 for empty cells), reserves (N x 2), turns (N)
+    and winners (N, -1 while the game goes on, as PylosState.winner).'''
+
+    def __init__(self, board, reserve, turn):
+        self.board = np.array(board, dtype=np.int8)
+        self.reserve = np.array(reserve, dtype=np.int8)
+        self.turn = np.array(turn, dtype=np.int8)
+        self.winner = np.full(len(self.board), -1, dtype=np.int8)
+        self.moves = 0
+        self._checkwinner(np.ones(len(self.board), dtype=bool))
+
+    @classmethod
+    def repeat(cls, state, count):
+        """'count' copies of a bitboard PylosState"""
+        board = np.full(NCELLS, EMPTY, dtype=np.int8)
+        for player, bits in enumerate(state.boards):
+            for i in range(NCELLS):
+                if bits >> i & 1:
+                    board[i] = player
+        return cls(np.tile(board, (count, 1)), np.tile(state.reserve, (count, 1)), np.full(count, state.turn))
+
+    def __len__(self):
+        return len(self.board)
+
+    def _checkwinner(self, games):
+        self.winner[games & (self.reserve[:, 1] < 1)] = 0
+        self.winner[games & (self.reserve[:, 0] < 1)] = 1
+
+    def step(self, rng):
+        """Plays a random legal move in each game still going on, removing as many balls as possible when a
+        square is made"""
+        games = np.flatnonzero(self.winner == -1)
+        if len(games) == 0:
+            return
+        board, reserve, player = self.board[games], self.reserve[games], self.turn[games]
+        n = np.arange(len(games))
+        candidates = np.concatenate([placements(board, reserve, player),
+                                     moveups(board, player).reshape(len(games), -1)], axis=1)
+        choice = _pick(candidates, rng)
+
+        # A player who cannot play loses
+        stuck = choice == -1
+        self.winner[games[stuck]] = 1 - player[stuck]
+
+        place = (choice >= 0) & (choice < NCELLS)
+        move = choice >= NCELLS
+        to = np.where(place, choice, (choice - NCELLS) % NCELLS)
+        source = (choice - NCELLS) // NCELLS
+        board[n[move], source[move]] = EMPTY
+        board[n[~stuck], to[~stuck]] = player[~stuck]
+        reserve[n[place], player[place]] -= 1
+
+        square = ~stuck & (squares(board, player) & _CELLSQUARES[to]).any(axis=1)
+        for removal in range(2):
+            ball = _pick(movable(board, player) & square[:, None], rng)
+            removed = ball >= 0
+            board[n[removed], ball[removed]] = EMPTY
+            reserve[n[removed], player[removed]] += 1
+
+        self.board[games], self.reserve[games] = board, reserve
+        self.turn[games] = np.where(stuck, player, 1 - player)
+        playing = np.zeros(len(self), dtype=bool)
+        playing[games[~stuck]] = True
+        self._checkwinner(playing)
+        self.moves += 1
+
+    def run(self, rng, maxmoves=MAXMOVES):
+        """Plays every game until its end (or 'maxmoves' moves) and returns the winners (-1 for unfinished games)"""
+        while self.moves < maxmoves and (self.winner == -1).any():
+            self.step(rng)
+        return self.winner
+
+
+def playouts(state, count, rng):
+    """Plays 'count' random games from a bitboard PylosState, returns the number of games won by each player"""
+    winner = Batch.repeat(state, count).run(rng)
+    return int((winner == 0).sum()), int((winner == 1).sum())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Statistics of random Pylos games simulated in batch')
+    parser.add_argument('--games', help='number of games (default: 10000)', type=int, default=10000)
+    parser.add_argument('--seed', help='seed of the random generator', type=int)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+    start = time.perf_counter()
+    batch = Batch(np.full((args.games, NCELLS), EMPTY), np.full((args.games, 2), 15), np.zeros(args.games))
+    lengths = np.zeros(args.games, dtype=np.int32)
+    while batch.moves < MAXMOVES and (batch.winner == -1).any():
+        lengths += batch.winner == -1
+        batch.step(rng)
+    elapsed = time.perf_counter() - start
+    print('{} games in {:.2f} s ({:.0f} games/s)'.format(args.games, elapsed, args.games / elapsed))
+    for player, name in ((0, 'Light'), (1, 'Dark')):
+        print('{} wins: {:.1%}'.format(name, (batch.winner == player).mean()))
+    print('Unfinished: {:.1%}'.format((batch.winner == -1).mean()))
+    print('Moves per game: {:.1f} (min {}, max {})'.format(lengths.mean(), lengths.min(), lengths.max()))
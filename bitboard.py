@@ -0,0 +1,509 @@
+# bitboard.py
+# Author: Elise Raxhon & Julien Beard
+# Version: October 18, 2026
+# -*- coding: utf-8 -*-
+
+import json
+import random
+
+from geometry import (CELLS, INDEX, LAYER, SUPPORTS, COVERS, SUPPORT_MASK, COVER_MASK, SQUARE_MASKS,
+                      DISTINCT_SQUARE_MASKS, popcount)
+from lib import game
+
+
+# Zobrist keys: one per (player, cell), one per (player, reserve) and one for the second player to play
+_random = random.Random(20170519)
+ZOBRIST_CELL = [[_random.getrandbits(64) for i in range(len(CELLS))] for player in range(2)]
+ZOBRIST_RESERVE = [[_random.getrandbits(64) for reserve in range(16)] for player in range(2)]
+ZOBRIST_TURN = _random.getrandbits(64)
+
+# Cells whose counters (see PylosState._computecounts) can change when a ball is put on or taken from cell i,
+# as (bit, mask) pairs:
+#   _FREE_REGION[i]:    cells that can become free or stop being free (i and the cells resting on it), with the
+#                       mask of their supports
+#   _MOVABLE_REGION[i]: balls that can become movable or stop being movable (i and the cells under it), with the
+#                       mask of the cells resting on them
+#   _PAIR_REGION[i]:    mask of the cells of the upper layers whose pairs can change
+_FREE_REGION = []
+_MOVABLE_REGION = []
+_PAIR_REGION = []
+for _i in range(len(CELLS)):
+    _FREE_REGION.append(tuple((1 << j, SUPPORT_MASK[j]) for j in (_i,) + COVERS[_i]))
+    _MOVABLE_REGION.append(tuple((1 << j, COVER_MASK[j]) for j in (_i,) + SUPPORTS[_i]))
+    _cells = {_i} | set(COVERS[_i])
+    for _j in (_i,) + SUPPORTS[_i]:
+        _cells |= set(COVERS[_j])
+    _PAIR_REGION.append(sum(1 << j for j in _cells if LAYER[j] > 0))
+
+
+def _indices(mask):
+    """Generates the indices of the cells set in 'mask', lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _movable(own, occupied):
+    """Returns the mask of the balls of 'own' with nothing resting on them"""
+    mask = 0
+    for i in _indices(own):
+        if not occupied & COVER_MASK[i]:
+            mask |= 1 << i
+    return mask
+
+
+def _removals(move, to, own, occupied):
+    """Generates the variants of 'move' removing one or two balls, if the ball arriving at 'to' completes a square
+    ('own' and 'occupied' are the masks after the move)"""
+    for square in SQUARE_MASKS[to]:
+        if own & square == square:
+            break
+    else:
+        return
+    first = _movable(own, occupied)
+    for one in _indices(first):
+        yield dict(move, remove=[list(CELLS[one])])
+        bit = 1 << one
+        for two in _indices(_movable(own ^ bit, occupied ^ bit)):
+            # Two balls that were both free can be removed in any order, keep one of them
+            if two < one and first >> two & 1:
+                continue
+            yield dict(move, remove=[list(CELLS[one]), list(CELLS[two])])
+
+
+def _countsquares(b0, b1, squares):
+    """Numbers of 'squares' (masks) where each player has three balls and the fourth cell is empty"""
+    occupied = b0 | b1
+    count0 = count1 = 0
+    for square in squares:
+        balls = occupied & square
+        if popcount(balls) == 3:
+            if b0 & square == balls:
+                count0 += 1
+            elif b1 & square == balls:
+                count1 += 1
+    return count0, count1
+
+
+def _countpairs(cells, free, movable0, movable1):
+    """Numbers of movable balls of each player under the free cells of the mask 'cells'"""
+    cells &= free
+    count0 = count1 = 0
+    while cells:
+        low = cells & -cells
+        support = SUPPORT_MASK[low.bit_length() - 1]
+        count0 += popcount(movable0 & support)
+        count1 += popcount(movable1 & support)
+        cells ^= low
+    return count0, count1
+
+
+def encodestate(boards, reserve, turn):
+    """Packs a state into 18 hexadecimal digits: 30 bits per board, 4 bits per reserve and 1 bit for the turn"""
+    return '{:018x}'.format(boards[0] | boards[1] << 30 | reserve[0] << 60 | reserve[1] << 64 | turn << 68)
+
+
+def decodestate(data):
+    """Inverse of encodestate, returns the tuple of PylosState.pack"""
+    value = int(data, 16)
+    mask = (1 << 30) - 1
+    return value & mask, value >> 30 & mask, value >> 60 & 15, value >> 64 & 15, value >> 68 & 1
+
+
+def encodemove(move):
+    """Packs a move into an int: 5 bits for 'to', 'from' and each removal (31 when absent)"""
+    cells = [move['to'], move['from'] if move['move'] == 'move' else None] + list(move.get('remove', []))
+    cells += [None] * (4 - len(cells))
+    code = 0
+    for shift, cell in enumerate(cells):
+        code |= (31 if cell is None else INDEX[tuple(cell)]) << 5 * shift
+    return code
+
+
+def decodemove(code):
+    """Unpacks a move packed by encodemove"""
+    to, source, one, two = (code >> 5 * shift & 31 for shift in range(4))
+    move = {'move': 'place', 'to': list(CELLS[to])}
+    if source != 31:
+        move = {'move': 'move', 'from': list(CELLS[source]), 'to': list(CELLS[to])}
+    if one != 31:
+        move['remove'] = [list(CELLS[i]) for i in (one, two) if i != 31]
+    return move
+
+
+class PylosState(game.GameState):
+    '''Class representing a state for the Pylos game, stored as one 30-bit integer per player.'''
+
+    def __init__(self, initialstate=None):
+        self._boards = [0, 0]
+        self._reserve = [15, 15]
+        self._turn = 0
+        if initialstate is not None:
+            for i, (layer, row, column) in enumerate(CELLS):
+                value = initialstate['board'][layer][row][column]
+                if value is not None:
+                    self._boards[value] |= 1 << i
+            self._reserve = list(initialstate['reserve'])
+            self._turn = initialstate['turn']
+        self._key = self._computekey()
+        self._computecounts()
+
+    def _computekey(self):
+        """Computes the Zobrist key of the state from scratch"""
+        key = ZOBRIST_TURN if self._turn == 1 else 0
+        for player in (0, 1):
+            for i in _indices(self._boards[player]):
+                key ^= ZOBRIST_CELL[player][i]
+            key ^= ZOBRIST_RESERVE[player][self._reserve[player]]
+        return key
+
+    def _computecounts(self):
+        """Computes from scratch the counters read by the evaluation and by legal_moves, kept up to date by set and
+        remove in the tuple _counts: the mask of the free cells (empty and supported), the masks of the balls of
+        each player with nothing resting on them, the number of squares where each player has three balls and
+        the fourth cell is empty, the sum of the layers of the balls of each player and the number of pairs
+        (movable ball of the player, free cell resting on it) of each player"""
+        b0, b1 = self._boards
+        occupied = b0 | b1
+        free = 0
+        movable = [0, 0]
+        for i in range(len(CELLS)):
+            bit = 1 << i
+            if occupied & bit:
+                if not occupied & COVER_MASK[i]:
+                    movable[0 if b0 & bit else 1] |= bit
+            elif occupied & SUPPORT_MASK[i] == SUPPORT_MASK[i]:
+                free |= bit
+        squares0, squares1 = _countsquares(b0, b1, DISTINCT_SQUARE_MASKS)
+        height0, height1 = (sum(LAYER[i] for i in _indices(board)) for board in (b0, b1))
+        pairs0, pairs1 = _countpairs(free, free, movable[0], movable[1])
+        self._counts = (free, movable[0], movable[1], squares0, squares1, height0, height1, pairs0, pairs1)
+
+    def _flip(self, player, i):
+        """Puts a ball of 'player' on the empty cell i or takes it from there, updating the key and the counters"""
+        free, movable0, movable1, squares0, squares1, height0, height1, pairs0, pairs1 = self._counts
+        b0, b1 = self._boards
+        region = _PAIR_REGION[i]
+        square = SQUARE_MASKS[i]
+        before0, before1 = _countpairs(region, free, movable0, movable1)
+        pairs0 -= before0
+        pairs1 -= before1
+        before0, before1 = _countsquares(b0, b1, square)
+        squares0 -= before0
+        squares1 -= before1
+
+        bit = 1 << i
+        if player == 0:
+            b0 ^= bit
+            height0 += LAYER[i] if b0 & bit else -LAYER[i]
+        else:
+            b1 ^= bit
+            height1 += LAYER[i] if b1 & bit else -LAYER[i]
+        self._boards[player] ^= bit
+        self._key ^= ZOBRIST_CELL[player][i]
+        occupied = b0 | b1
+        for cell, support in _FREE_REGION[i]:
+            if not occupied & cell and occupied & support == support:
+                free |= cell
+            else:
+                free &= ~cell
+        for cell, cover in _MOVABLE_REGION[i]:
+            movable0 &= ~cell
+            movable1 &= ~cell
+            if not occupied & cover:
+                if b0 & cell:
+                    movable0 |= cell
+                elif b1 & cell:
+                    movable1 |= cell
+
+        after0, after1 = _countpairs(region, free, movable0, movable1)
+        pairs0 += after0
+        pairs1 += after1
+        after0, after1 = _countsquares(b0, b1, square)
+        self._counts = (free, movable0, movable1, squares0 + after0, squares1 + after1, height0, height1, pairs0,
+                        pairs1)
+
+    @property
+    def _state(self):
+        """Snapshot of the state in the format of the list-based PylosState (changes are not written back)"""
+        return {'visible': self.visible(), 'hidden': None}
+
+    def __str__(self):
+        return json.dumps(self.visible(), separators=(',', ':'))
+
+    def __repr__(self):
+        return json.dumps(self._state, separators=(',', ':'))
+
+    @property
+    def turn(self):
+        return self._turn
+
+    @property
+    def reserve(self):
+        return tuple(self._reserve)
+
+    @property
+    def boards(self):
+        return tuple(self._boards)
+
+    @property
+    def free(self):
+        """Mask of the empty cells where a ball can be put"""
+        return self._counts[0]
+
+    @property
+    def movable(self):
+        """Masks of the balls of each player with nothing resting on them"""
+        return self._counts[1:3]
+
+    @property
+    def squares(self):
+        """Number of squares where each player has three balls and the fourth cell is empty"""
+        return self._counts[3:5]
+
+    @property
+    def height(self):
+        """Sum of the layers of the balls of each player"""
+        return self._counts[5:7]
+
+    @property
+    def pairs(self):
+        """Number of (movable ball of the player, free cell resting on it) pairs of each player, the moves to an
+        upper layer that are not possible because the ball would support itself"""
+        return self._counts[7:9]
+
+    @property
+    def key(self):
+        """64-bit Zobrist key of the state, kept up to date by set, remove, update and undo"""
+        return self._key
+
+    def visible(self):
+        """Returns the state as the nested 'board', 'reserve', 'turn' dictionary used on the wire"""
+        board = [[[None] * (4 - layer) for row in range(4 - layer)] for layer in range(4)]
+        for player in (0, 1):
+            bits = self._boards[player]
+            while bits:
+                low = bits & -bits
+                layer, row, column = CELLS[low.bit_length() - 1]
+                board[layer][row][column] = player
+                bits ^= low
+        return {
+            'board': board,
+            'reserve': list(self._reserve),
+            'turn': self._turn
+        }
+
+    def copy(self):
+        """Returns an independent copy of this state (two ints and two small lists)"""
+        other = PylosState.__new__(PylosState)
+        other._boards = self._boards[:]
+        other._reserve = self._reserve[:]
+        other._turn = self._turn
+        other._key = self._key
+        other._counts = self._counts
+        return other
+
+    def pack(self):
+        """Returns the state as a tuple of ints (boards, reserves and turn), cheap to send to another process"""
+        return (self._boards[0], self._boards[1], self._reserve[0], self._reserve[1], self._turn)
+
+    @classmethod
+    def unpack(cls, data):
+        """Builds a state from the tuple returned by pack"""
+        state = cls.__new__(cls)
+        state._boards = [data[0], data[1]]
+        state._reserve = [data[2], data[3]]
+        state._turn = data[4]
+        state._key = state._computekey()
+        state._computecounts()
+        return state
+
+    def encode(self):
+        return encodestate(self._boards, self._reserve, self._turn)
+
+    @classmethod
+    def decode(cls, data):
+        if data.startswith('{'):
+            return cls.parse(data)
+        return cls.unpack(decodestate(data))
+
+    def _index(self, layer, row, column):
+        i = INDEX.get((layer, row, column))
+        if i is None:
+            raise game.InvalidMoveException('The position ({}) is outside of the board'.format([layer, row, column]))
+        return i
+
+    def _value(self, i):
+        bit = 1 << i
+        if self._boards[0] & bit:
+            return 0
+        if self._boards[1] & bit:
+            return 1
+        return None
+
+    def get(self, layer, row, column):
+        """Checks if the position (layer,row,column) is on the board"""
+        return self._value(self._index(layer, row, column))
+
+    def safeGet(self, layer, row, column):
+        i = INDEX.get((layer, row, column))
+        return None if i is None else self._value(i)
+
+    def validPosition(self, layer, row, column):
+        """Checks if the position is free and stable"""
+        i = self._index(layer, row, column)
+        occupied = self._boards[0] | self._boards[1]
+        if occupied >> i & 1:
+            raise game.InvalidMoveException('The position ({}) is not free'.format([layer, row, column]))
+        if occupied & SUPPORT_MASK[i] != SUPPORT_MASK[i]:
+            raise game.InvalidMoveException('The position ({}) is not stable'.format([layer, row, column]))
+
+    def canMove(self, layer, row, column):
+        i = self._index(layer, row, column)
+        occupied = self._boards[0] | self._boards[1]
+        if not occupied >> i & 1:
+            raise game.InvalidMoveException('The position ({}) is empty'.format([layer, row, column]))
+        if occupied & COVER_MASK[i]:
+            raise game.InvalidMoveException('The position ({}) is not movable'.format([layer, row, column]))
+
+    def createSquare(self, coord):
+        i = INDEX.get(tuple(coord))
+        if i is None:
+            return False
+        b0, b1 = self._boards
+        for square in SQUARE_MASKS[i]:
+            if b0 & square == square or b1 & square == square:
+                return True
+        return False
+
+    def set(self, coord, value):
+        """It is called to add a ball on the board"""
+        layer, row, column = tuple(coord)
+        self.validPosition(layer, row, column)
+        self._flip(value, INDEX[(layer, row, column)])
+
+    def remove(self, coord, player):
+        layer, row, column = tuple(coord)
+        self.canMove(layer, row, column)
+        i = INDEX[(layer, row, column)]
+        if not self._boards[player] >> i & 1:
+            raise game.InvalidMoveException('not your sphere')
+        self._flip(player, i)
+
+    def _setreserve(self, player, reserve):
+        self._key ^= ZOBRIST_RESERVE[player][self._reserve[player]] ^ ZOBRIST_RESERVE[player][reserve]
+        self._reserve[player] = reserve
+
+    def update(self, move, player):
+        """update the state with the move and raise game.InvalidMoveException, return the record to give to undo"""
+        record = self._record()
+        if move['move'] == 'place':
+            if self._reserve[player] < 1:
+                raise game.InvalidMoveException('no more sphere')
+            self.set(move['to'], player)
+            self._setreserve(player, self._reserve[player] - 1)
+        elif move['move'] == 'move':
+            if move['to'][0] <= move['from'][0]:
+                raise game.InvalidMoveException('you can only move to upper layer')
+            self.remove(move['from'], player)
+            try:
+                self.set(move['to'], player)
+            except game.InvalidMoveException as e:
+                self.set(move['from'], player)
+                raise e
+        else:
+            raise game.InvalidMoveException('Invalid Move:\n{}'.format(move))
+
+        if 'remove' in move:
+            if not self.createSquare(move['to']):
+                raise game.InvalidMoveException('You cannot remove spheres')
+            if len(move['remove']) > 2:
+                raise game.InvalidMoveException('Can\'t remove more than 2 spheres')
+            for coord in move['remove']:
+                self.remove(coord, player)
+                self._setreserve(player, self._reserve[player] + 1)
+        self._turn = (self._turn + 1) % 2
+        self._key ^= ZOBRIST_TURN
+        return record
+
+    def _record(self):
+        boards, reserve = self._boards, self._reserve
+        return boards[0], boards[1], reserve[0], reserve[1], self._turn, self._key, self._counts
+
+    def undo(self, record):
+        """Restore the state as it was before the update that returned 'record'"""
+        boards, reserve = self._boards, self._reserve
+        boards[0], boards[1], reserve[0], reserve[1], self._turn, self._key, self._counts = record
+
+    def applymove(self, move):
+        """Plays the JSON move 'move' for the player to play, the state is unchanged if it is invalid"""
+        try:
+            move = json.loads(move)
+        except json.JSONDecodeError:
+            raise game.InvalidMoveException('move must be valid JSON string: {}'.format(move))
+        record = self._record()
+        try:
+            self.update(move, self._turn)
+        except game.InvalidMoveException:
+            self.undo(record)
+            raise
+
+    def winner(self):
+        """return 0 or 1 if a winner, return None if draw, return -1 if game continue"""
+        if self._reserve[0] < 1:
+            return 1
+        elif self._reserve[1] < 1:
+            return 0
+        return -1
+
+    def legal_moves(self):
+        """Generates every legal move of the player to play: placements from the reserve and moves to an upper
+        layer, each without removal and, when it completes a square, with every choice of one or two removals"""
+        player = self._turn
+        own = self._boards[player]
+        occupied = own | self._boards[1 - player]
+        free = self._counts[0]
+        movable = self._counts[1 + player]
+
+        if self._reserve[player] > 0:
+            for to in _indices(free):
+                move = {'move': 'place', 'to': list(CELLS[to])}
+                yield move
+                yield from _removals(move, to, own | 1 << to, occupied | 1 << to)
+
+        for source in _indices(movable):
+            layer = CELLS[source][0]
+            if layer == 3:
+                continue
+            source_bit = 1 << source
+            for to in _indices(free):
+                if CELLS[to][0] <= layer or SUPPORT_MASK[to] & source_bit:
+                    continue
+                move = {'move': 'move', 'from': list(CELLS[source]), 'to': list(CELLS[to])}
+                yield move
+                yield from _removals(move, to, own ^ source_bit | 1 << to, occupied ^ source_bit | 1 << to)
+
+    def val2str(self, val):
+        return '_' if val == None else '@' if val == 0 else 'O'
+
+    def player2str(self, val):
+        return 'Light' if val == 0 else 'Dark'
+
+    def printSquare(self, matrix):
+        print(' ' + '_' * (len(matrix) * 2 - 1))
+        print('\n'.join(map(lambda row: '|' + '|'.join(map(self.val2str, row)) + '|', matrix)))
+
+    def prettyprint(self):
+        """print the state"""
+        state = self.visible()
+        for layer in range(4):
+            self.printSquare(state['board'][layer])
+            print()
+
+        for player, reserve in enumerate(state['reserve']):
+            print('Reserve of {}:'.format(self.player2str(player)))
+            print((self.val2str(player) + ' ') * reserve)
+            print()
+
+        print('{} to play !'.format(self.player2str(state['turn'])))
@@ -0,0 +1,122 @@
+# book.py
+# Author: Elise Raxhon & Julien Beard
+# Version: October 18, 2026
+# -*- coding: utf-8 -*-
+
+import argparse
+import mmap
+import random
+import struct
+
+import bitboard
+import evaluation
+import ordering
+import search
+import symmetry
+import transposition
+
+MAGIC = b'PYOB'
+HEADER = struct.Struct('<4sII')
+# One record per (position, move): canonical key of the position, packed move (in the canonical orientation of
+# the position, see symmetry.canonical), number of games in which the search chose it, sum of the scores given
+# by the search
+RECORD = struct.Struct('<QIIi')
+
+DEFAULT_PLIES = 8
+
+
+def selfplay(games, plies=DEFAULT_PLIES, budget=1.0, randomness=0.3, seed=None, evaluate=None):
+    """Plays the first 'plies' moves of 'games' games, searching each position for 'budget' seconds with the
+    evaluation function 'evaluate' (by default the one of the client, evaluation.Evaluation with the default
+    weights). The best move found is recorded, but a random move is played with probability 'randomness' so that
+    the games differ. Returns {(key, move): [count, score]}."""
+    rand = random.Random(seed)
+    if evaluate is None:
+        evaluate = evaluation.Evaluation()
+    engine = search.Search(evaluate, transposition.TranspositionTable(64), ordering=ordering.MoveOrdering())
+    statistics = {}
+    for game in range(games):
+        state = bitboard.PylosState()
+        for ply in range(plies):
+            if state.winner() != -1:
+                break
+            score, pv, depth = engine.iterate(state, budget)
+            key, t = symmetry.canonical(state)
+            entry = statistics.setdefault((key, bitboard.encodemove(symmetry.transformmove(pv[0], t))), [0, 0])
+            entry[0] += 1
+            entry[1] += score
+            move = rand.choice(list(state.legal_moves())) if rand.random() < randomness else pv[0]
+            state.update(move, state.turn)
+    return statistics
+
+
+def write(path, statistics):
+    """Writes the statistics returned by selfplay, sorted by key"""
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, 1, len(statistics)))
+        for (key, move), (count, score) in sorted(statistics.items()):
+            file.write(RECORD.pack(key, move, count, score))
+
+
+class OpeningBook:
+    '''Opening book file mapped in memory, looked up by binary search on the keys.'''
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.__count = HEADER.unpack_from(self.__map)
+        if magic != MAGIC:
+            raise ValueError('{} is not an opening book file'.format(path))
+
+    def __len__(self):
+        return self.__count
+
+    def close(self):
+        self.__map.close()
+
+    def __record(self, i):
+        return RECORD.unpack_from(self.__map, HEADER.size + i * RECORD.size)
+
+    def moves(self, state):
+        """Returns the [(move, count, average score)] recorded for 'state' or any of its symmetric positions"""
+        key, t = symmetry.canonical(state)
+        inverse = symmetry.INVERSE[t]
+        low, high = 0, self.__count
+        while low < high:
+            middle = (low + high) // 2
+            if self.__record(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        result = []
+        while low < self.__count:
+            recordkey, move, count, score = self.__record(low)
+            if recordkey != key:
+                break
+            result.append((symmetry.transformmove(bitboard.decodemove(move), inverse), count, score / count))
+            low += 1
+        return result
+
+    def bestmove(self, state):
+        """Returns the move most often chosen in 'state' (the best average score breaks ties), or None"""
+        moves = self.moves(state)
+        if not moves:
+            return None
+        return max(moves, key=lambda entry: (entry[1], entry[2]))[0]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Pylos opening book generator')
+    parser.add_argument('path', help='opening book file to write')
+    parser.add_argument('--games', help='number of self-play games (default: 100)', type=int, default=100)
+    parser.add_argument('--plies', help='number of moves recorded per game (default: {})'.format(DEFAULT_PLIES),
+                        type=int, default=DEFAULT_PLIES)
+    parser.add_argument('--time', help='search time per position in seconds (default: 1)', type=float, default=1.0)
+    parser.add_argument('--seed', help='seed of the random moves', type=int)
+    parser.add_argument('--weights', help='JSON file of the evaluation weights of the search, as for the client '
+                                          '(default: the built-in ones)')
+    args = parser.parse_args()
+    evaluate = evaluation.Evaluation.load(args.weights) if args.weights else None
+    statistics = selfplay(args.games, args.plies, args.time, seed=args.seed, evaluate=evaluate)
+    write(args.path, statistics)
+    print('{} positions, {} moves'.format(len({key for key, move in statistics}), len(statistics)))
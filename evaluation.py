@@ -0,0 +1,73 @@
+# evaluation.py
+# Author: Elise Raxhon & Julien Beard
+# Version: October 18, 2026
+# -*- coding: utf-8 -*-
+
+import json
+from operator import mul
+
+from geometry import LAYER_MASKS, popcount
+
+# Features of a position, each the difference between the player to play and the opponent:
+#   reserve:  balls left in the reserve
+#   squares:  squares with three of the player's balls and an empty fourth cell
+#   movable:  balls with nothing resting on them (they can be moved up or removed)
+#   height:   sum of the layers of the balls on the board
+#   mobility: legal moves, without counting removals
+FEATURES = ('reserve', 'squares', 'movable', 'height', 'mobility')
+# One ball in the reserve is worth 100
+DEFAULT_WEIGHTS = {'reserve': 100, 'squares': 20, 'movable': 5, 'height': 2, 'mobility': 1}
+
+LAYER0, LAYER1, LAYER2, LAYER3 = LAYER_MASKS
+# Cells of the layers above the first, second and third ones
+ABOVE0, ABOVE1, ABOVE2 = LAYER1 | LAYER2 | LAYER3, LAYER2 | LAYER3, LAYER3
+
+
+def features(state):
+    """Returns the values of FEATURES for a bitboard PylosState, from the point of view of the player to play.
+    They are read from the counters the state keeps up to date move by move (see PylosState._computecounts):
+    a ball can move up to every free cell of an upper layer but the ones resting on it, counted by the pairs."""
+    player, other = state.turn, 1 - state.turn
+    reserve = state.reserve
+    squares = state.squares
+    height = state.height
+    movable = state.movable
+    pairs = state.pairs
+    free = state.free
+    freecount = popcount(free)
+    above0, above1, above2 = popcount(free & ABOVE0), popcount(free & ABOVE1), popcount(free & ABOVE2)
+    mobility = [0, 0]
+    for side in (player, other):
+        balls = movable[side]
+        mobility[side] = ((freecount if reserve[side] > 0 else 0) - pairs[side] + popcount(balls & LAYER0) * above0
+                          + popcount(balls & LAYER1) * above1 + popcount(balls & LAYER2) * above2)
+
+    return (reserve[player] - reserve[other], squares[player] - squares[other],
+            popcount(movable[player]) - popcount(movable[other]), height[player] - height[other],
+            mobility[player] - mobility[other])
+
+
+class Evaluation:
+    '''Linear evaluation function: the weighted sum of the features of a position, rounded to an integer.
+    Instances are called as functions (search.Search takes them as 'evaluate').'''
+
+    def __init__(self, weights=None):
+        weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        unknown = set(weights) - set(FEATURES)
+        if unknown:
+            raise ValueError('unknown features: {}'.format(', '.join(sorted(unknown))))
+        self.weights = weights
+        self.__vector = tuple(weights[feature] for feature in FEATURES)
+
+    @classmethod
+    def load(cls, path):
+        """Reads the weights from a JSON file {feature: weight}, the missing ones keep their default value"""
+        with open(path) as file:
+            return cls(json.load(file))
+
+    def save(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.weights, file, indent=4)
+
+    def __call__(self, state):
+        return round(sum(map(mul, self.__vector, features(state))))
@@ -0,0 +1,69 @@
+# geometry.py
+# Author: Elise Raxhon & Julien Beard
+# Version: October 18, 2026
+# -*- coding: utf-8 -*-
+
+# Cells of the pyramid, numbered layer by layer, row by row (same order as the board loops)
+CELLS = [(layer, row, column) for layer in range(4) for row in range(4 - layer) for column in range(4 - layer)]
+INDEX = {cell: i for i, cell in enumerate(CELLS)}
+# Layer of each cell, and the cells of each layer as a bit mask
+LAYER = [layer for layer, row, column in CELLS]
+LAYER_MASKS = [sum(1 << i for i in range(len(CELLS)) if LAYER[i] == layer) for layer in range(4)]
+
+# Games still going on after this number of moves are counted as draws (arena games and random playouts)
+MAXMOVES = 300
+
+# For each cell i:
+#   SUPPORTS[i]: the four cells under i (empty on the first layer)
+#   COVERS[i]:   the cells resting on i
+#   SQUARES[i]:  the squares (four cells of the same layer) i belongs to
+SUPPORTS = []
+COVERS = []
+SQUARES = []
+
+# The same tables as bit masks, for the bitboard engine
+SUPPORT_MASK = []
+COVER_MASK = []
+SQUARE_MASKS = []
+
+
+def _cells(coords):
+    """Returns the indices of the given coordinates that are on the board"""
+    return tuple(INDEX[coord] for coord in coords if coord in INDEX)
+
+
+def _mask(cells):
+    mask = 0
+    for i in cells:
+        mask |= 1 << i
+    return mask
+
+
+for layer, row, column in CELLS:
+    if layer > 0:
+        SUPPORTS.append(_cells([(layer - 1, row, column), (layer - 1, row + 1, column),
+                                (layer - 1, row + 1, column + 1), (layer - 1, row, column + 1)]))
+    else:
+        SUPPORTS.append(())
+    COVERS.append(_cells([(layer + 1, row, column), (layer + 1, row - 1, column),
+                          (layer + 1, row - 1, column - 1), (layer + 1, row, column - 1)]))
+    squares = []
+    for r, c in ((row, column), (row - 1, column), (row - 1, column - 1), (row, column - 1)):
+        if 0 <= r < 3 - layer and 0 <= c < 3 - layer:
+            squares.append(_cells([(layer, r, c), (layer, r + 1, c), (layer, r + 1, c + 1), (layer, r, c + 1)]))
+    SQUARES.append(tuple(squares))
+    SUPPORT_MASK.append(_mask(SUPPORTS[-1]))
+    COVER_MASK.append(_mask(COVERS[-1]))
+    SQUARE_MASKS.append(tuple(_mask(square) for square in squares))
+
+# The distinct squares of the pyramid, as cells and as bit masks
+DISTINCT_SQUARES = sorted({square for squares in SQUARES for square in squares})
+DISTINCT_SQUARE_MASKS = [_mask(square) for square in DISTINCT_SQUARES]
+
+
+# Number of balls in a bit mask (int.bit_count only exists since Python 3.10)
+if hasattr(int, 'bit_count'):
+    popcount = int.bit_count
+else:
+    def popcount(mask):
+        return bin(mask).count('1')
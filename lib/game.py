@@ -3,13 +3,30 @@
 # Version: April 20, 2016
 
 from abc import *
+import asyncio
 import copy
 import json
 import socket
+import struct
 import sys
+import time
+import zlib
 
 DEFAULT_BUFFER_SIZE = 1024
 SECTION_WIDTH = 60
+# Option of the READY message asking for the states to be sent with GameState.encode rather than in JSON
+COMPACT = '+compact'
+# Option of the READY message asking for the moves played since the last turn of the player ('DELTA' message)
+# rather than the whole state, the client keeping its own state up to date with the applymove method of its state class
+DELTA = '+delta'
+# Every this number of DELTA messages, the checksum of the state is added so that the client can check its state
+# (the client answers 'RESYNC' instead of a move when it differs, and the server sends the whole state again)
+CHECK_INTERVAL = 10
+RESYNC = 'RESYNC'
+# Option of the READY message asking for framed messages: each message is preceded by its length in bytes, as a
+# 4-byte big-endian integer. The START message, sent before, is never framed.
+FRAMED = '+framed'
+FRAME = struct.Struct('>I')
 
 
 def _printsection(title):
@@ -23,6 +40,125 @@ class InvalidMoveException(Exception):
         super().__init__(message)
 
 
+class MessageStream:
+    '''Messages sent and received on a socket, framed or not.
+
+    Unframed (legacy) messages are read with a single recv, as many as one message at once. Framed messages
+    are read from a buffer until complete, whatever the way TCP splits or joins them. The mode of a stream can be
+    left undecided (framed None) after asking for framed messages: the first received byte tells, a framed message
+    starting with the 0 byte of its length and a legacy one with a letter.'''
+    def __init__(self, sock, framed=False, buffersize=DEFAULT_BUFFER_SIZE):
+        self.socket = sock
+        self.framed = framed
+        self.__buffersize = buffersize
+        self.__buffer = b''
+
+    def send(self, message):
+        data = message.encode()
+        if self.framed:
+            data = FRAME.pack(len(data)) + data
+        self.socket.sendall(data)
+
+    def __fill(self):
+        data = self.socket.recv(max(self.__buffersize, 4096) if self.framed else self.__buffersize)
+        if not data:
+            raise ConnectionError('connection closed')
+        self.__buffer += data
+
+    def receive(self):
+        if self.framed is None:
+            if not self.__buffer:
+                self.__fill()
+            self.framed = self.__buffer[0] == 0
+        if not self.framed:
+            if not self.__buffer:
+                self.__fill()
+            data, self.__buffer = self.__buffer, b''
+            return data.decode()
+        while len(self.__buffer) < FRAME.size:
+            self.__fill()
+        size = FRAME.unpack_from(self.__buffer)[0]
+        while len(self.__buffer) < FRAME.size + size:
+            self.__fill()
+        data = self.__buffer[FRAME.size:FRAME.size + size]
+        self.__buffer = self.__buffer[FRAME.size + size:]
+        return data.decode()
+
+    def close(self):
+        self.socket.close()
+
+
+class GameLog:
+    '''Newline-delimited JSON log of games, one record per line:
+    {"type": "start", "game": name, "time": timestamp, ...} when a game starts,
+    {"type": "move", "turn": number, "player": number, "move": move, "elapsed": seconds or None, ...} for each move,
+    {"type": "invalid", "turn": number, "player": number, "move": move, "error": message} for each rejected move,
+    {"type": "end", ...} when it ends.
+    The turn is the number of moves played in the game before this one, counted by the log unless given.
+    The server logs every move and the winner ("winner": number or None for a draw), a client only its own moves
+    (once the server accepted them), with the state it played in ("state"), and its result ("result": "won", "lost"
+    or "draw").
+    Games are appended to the file so that one log can hold many of them.'''
+    def __init__(self, path):
+        self.__file = open(path, 'a')
+        self.__turn = 0
+
+    def close(self):
+        self.__file.close()
+
+    def __write(self, record):
+        self.__file.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+    def start(self, game, **info):
+        self.__turn = 0
+        self.__write(dict({'type': 'start', 'game': game, 'time': time.time()}, **info))
+
+    def move(self, player, move, elapsed, turn=None, **info):
+        if turn is not None:
+            self.__turn = turn
+        self.__write(dict({'type': 'move', 'turn': self.__turn, 'player': player, 'move': move,
+                           'elapsed': None if elapsed is None else round(elapsed, 6)}, **info))
+        self.__turn += 1
+
+    def invalid(self, player, move, error, turn=None):
+        if turn is not None:
+            self.__turn = turn
+        self.__write({'type': 'invalid', 'turn': self.__turn, 'player': player, 'move': move, 'error': error})
+
+    def end(self, **info):
+        self.__write(dict({'type': 'end'}, **info))
+        self.__file.flush()
+
+
+def readlog(path):
+    '''Read a GameLog file.
+
+    Pre: 'path' is a file written by GameLog.
+    Post: Generates one dictionary per game, {'start': record, 'moves': [records], 'end': record}
+          ('end' is None for a game that was interrupted), reading the file line by line.
+    '''
+    game = None
+    with open(path) as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record['type'] == 'start':
+                if game is not None:
+                    yield game
+                game = {'start': record, 'moves': [], 'end': None}
+            elif game is None:
+                continue
+            elif record['type'] == 'move':
+                game['moves'].append(record)
+            elif record['type'] == 'end':
+                game['end'] = record
+                yield game
+                game = None
+    if game is not None:
+        yield game
+
+
 class GameState(metaclass=ABCMeta):
     '''Abstract class representing a generic game state.'''
     def __init__(self, visible, hidden=None):
@@ -58,6 +194,22 @@ class GameState(metaclass=ABCMeta):
     def parse(cls, state):
         return cls(json.loads(state))
 
+    def encode(self):
+        '''Compact encoding of the visible state, sent to the clients asking for it (COMPACT option).
+        It must not start with '{', which tells a JSON state. By default, the state is sent in JSON.'''
+        return str(self)
+
+    @classmethod
+    def decode(cls, data):
+        '''Inverse of encode, also reading JSON states (sent by servers that do not know the COMPACT option).'''
+        return cls.parse(data)
+
+    def checksum(self):
+        '''Checksum of the state sent with the DELTA option. Clients can only use this option if their state class
+        also defines applymove(move), applying a move (as sent by the player) for the player to play and raising
+        InvalidMoveException if it is invalid.'''
+        return zlib.crc32(self.encode().encode())
+
     @classmethod
     def buffersize(cls):
         return DEFAULT_BUFFER_SIZE
@@ -65,11 +217,13 @@ class GameState(metaclass=ABCMeta):
 
 class GameServer(metaclass=ABCMeta):
     '''Abstract class representing a generic game server.'''
-    def __init__(self, name, nbplayers, initialstate, verbose=False):
+    def __init__(self, name, nbplayers, initialstate, verbose=False, log=None):
         self.__name = name
         self.__nbplayers = nbplayers
         self.__verbose = verbose
         self._state = initialstate
+        # Path of a GameLog file where the moves are recorded (optional)
+        self.__log = log
         # Stats about the running game
         self.__currentplayer = None
         self.__turns = 0
@@ -104,6 +258,42 @@ class GameServer(metaclass=ABCMeta):
     def state(self):
         return copy.deepcopy(self._state)
 
+    def _startgame(self):
+        self.__currentplayer = 0
+        self.__turns = 0
+        # Moves played since the start of the game, for the DELTA option
+        self.__history = []
+
+    @staticmethod
+    def _peer(options):
+        '''What a player asked for in its READY message, and what it was last sent.'''
+        return {'compact': COMPACT in options, 'delta': DELTA in options, 'since': None, 'deltas': 0}
+
+    def _playmessage(self, peer):
+        '''Message asking the player described by 'peer' (see _peer) to play: the state, or, with the DELTA option,
+        the moves played since the last message it was sent.'''
+        if peer['delta'] and peer['since'] is not None:
+            peer['deltas'] += 1
+            check = self._state.checksum() if peer['deltas'] % CHECK_INTERVAL == 0 else None
+            message = 'DELTA {}'.format(json.dumps({'moves': self.__history[peer['since']:], 'check': check},
+                                                   separators=(',', ':')))
+        elif peer['compact']:
+            message = 'PLAY {}'.format(self._state.encode())
+        else:
+            message = 'PLAY {}'.format(self._state)
+        peer['since'] = len(self.__history)
+        return message
+
+    def _playmove(self, move):
+        '''Apply the move of the current player and give the turn to the next one.
+
+        Raises InvalidMoveException: If 'move' is invalid (the turn does not change).
+        '''
+        self.applymove(move)
+        self.__history.append(move)
+        self.__turns += 1
+        self.__currentplayer = (self.__currentplayer + 1) % self.nbplayers
+
     def _waitplayers(self):
         s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -114,11 +304,13 @@ class GameServer(metaclass=ABCMeta):
             print(' Game server listening on port {}.'.format(5000))
             print(' Waiting for {} players...'.format(self.nbplayers))
         self.__players = []
+        # Options of the players (see _peer)
+        self.__peers = []
         # Wait for enough players for a play
         try:
             while len(self.__players) < self.__nbplayers:
                 client = s.accept()[0]
-                self.__players.append(client)
+                self.__players.append(MessageStream(client, buffersize=self._state.__class__.buffersize()))
                 if self.__verbose:
                     print(' - Client connected from {}:{} ({}/{}).'
                           .format(*client.getpeername(), len(self.__players), self.nbplayers)
@@ -134,8 +326,13 @@ class GameServer(metaclass=ABCMeta):
                 if self.__verbose:
                     print(' Initialising player {}...'.format(i))
                 player = self.__players[i]
-                player.sendall('START {}'.format(i).encode())
-                data = player.recv(self._state.__class__.buffersize()).decode().split(' ')
+                player.send('START {}'.format(i))
+                data = player.receive().split(' ')
+                # Options of the READY message start with '+', the other word is the name of the player
+                options = [word for word in data[1:] if word.startswith('+')]
+                data = [word for word in data if not word.startswith('+')]
+                player.framed = FRAMED in options
+                self.__peers.append(self._peer(options))
                 if data[0] != 'READY':
                     if self.__verbose:
                         print(' - Player {} not ready to start.'.format(i))
@@ -153,8 +350,11 @@ class GameServer(metaclass=ABCMeta):
         return True
 
     def _gameloop(self):
-        self.__currentplayer = 0
+        self._startgame()
         winner = -1
+        log = GameLog(self.__log) if self.__log is not None else None
+        if log is not None:
+            log.start(self.name, players=self.nbplayers)
         if self.__verbose:
             print(' Initial state:')
             self._state.prettyprint()
@@ -163,34 +363,47 @@ class GameServer(metaclass=ABCMeta):
             player = self.__players[self.__currentplayer]
             if self.__verbose:
                 print("\n=> Turn #{} (player {})".format(self.turns, self.__currentplayer))
-            player.sendall('PLAY {}'.format(self.state).encode())
+            peer = self.__peers[self.__currentplayer]
+            player.send(self._playmessage(peer))
+            start = time.monotonic()
             try:
-                move = player.recv(self._state.__class__.buffersize()).decode()
+                move = player.receive()
+                while move == RESYNC:
+                    peer['since'] = None
+                    player.send(self._playmessage(peer))
+                    move = player.receive()
+                elapsed = time.monotonic() - start
                 if self.__verbose:
                     print('   Move:', move)
-                self.applymove(move)
-                self.__turns += 1
-                self.__currentplayer = (self.__currentplayer + 1) % self.nbplayers
+                current = self.__currentplayer
+                self._playmove(move)
+                if log is not None:
+                    log.move(current, move, elapsed)
             except InvalidMoveException as e:
                 if self.__verbose:
                     print('Invalid move:', e)
-                player.sendall('ERROR {}'.format(e).encode())
+                if log is not None:
+                    log.invalid(self.__currentplayer, move, str(e))
+                player.send('ERROR {}'.format(e))
             if self.__verbose:
                 print('   State:')
                 self._state.prettyprint()
             winner = self._state.winner()
+        if log is not None:
+            log.end(winner=winner)
+            log.close()
         if self.__verbose:
             _printsection('Game finished')
         # Notify players about won/lost status
         if winner is not None:
             for i in range(self.nbplayers):
-                self.__players[i].sendall(('WON' if winner == i else 'LOST').encode())
+                self.__players[i].send('WON' if winner == i else 'LOST')
             if self.__verbose:
                 print(' The winner is player {}.'.format(winner))
         # Notify players that the game ended
         else:
             for player in self.__players:
-                player.sendall('END'.encode())
+                player.send('END')
         # Close the connexions with the clients
         for player in self.__players:
             player.close()
@@ -202,11 +415,159 @@ class GameServer(metaclass=ABCMeta):
             self._gameloop()
 
 
+class GameHost:
+    '''Game server playing many games at the same time in one process (asyncio): clients are accepted without
+    limit and grouped by order of arrival into games of 'nbplayers' players, each played on a new GameServer built
+    by 'factory' (it is only used for its state and its applymove method, it does not open any socket).'''
+    def __init__(self, factory, port=5000, verbose=False, log=None, maxgames=None):
+        self.__factory = factory
+        self.__nbplayers = factory().nbplayers
+        self.__port = port
+        self.__verbose = verbose
+        # Path of a GameLog file, each game is written at once when it ends
+        self.__log = log
+        # The host stops after this number of games (None to run until interrupted)
+        self.__maxgames = maxgames
+        self.__waiting = []
+        self.__started = 0
+        self.__finished = 0
+        self.__games = set()
+
+    @property
+    def finished(self):
+        return self.__finished
+
+    def run(self):
+        try:
+            asyncio.run(self._serve())
+        except KeyboardInterrupt:
+            pass
+        if self.__verbose:
+            _printsection('Game host ended')
+
+    async def _serve(self):
+        self.__done = asyncio.Event()
+        server = await asyncio.start_server(self._connected, '0.0.0.0', self.__port, reuse_address=True)
+        if self.__verbose:
+            _printsection('Starting game host')
+            print(' Game host listening on port {}.'.format(self.__port))
+        async with server:
+            await self.__done.wait()
+        if self.__games:
+            await asyncio.gather(*self.__games)
+
+    async def _connected(self, reader, writer):
+        if self.__maxgames is not None and self.__started >= self.__maxgames:
+            writer.close()
+            return
+        self.__waiting.append((reader, writer))
+        if self.__verbose:
+            print(' - Client connected from {}:{} ({} waiting).'.format(*writer.get_extra_info('peername')[:2],
+                                                                        len(self.__waiting)))
+        if len(self.__waiting) >= self.__nbplayers:
+            players = self.__waiting[:self.__nbplayers]
+            del self.__waiting[:self.__nbplayers]
+            self.__started += 1
+            task = asyncio.ensure_future(self._play(self.__factory(), players, self.__started))
+            self.__games.add(task)
+            task.add_done_callback(self.__games.discard)
+
+    async def _send(self, writer, message, framed=False):
+        data = message.encode()
+        writer.write(FRAME.pack(len(data)) + data if framed else data)
+        await writer.drain()
+
+    async def _receive(self, game, reader, framed=False):
+        if framed:
+            size = FRAME.unpack(await reader.readexactly(FRAME.size))[0]
+            return (await reader.readexactly(size)).decode()
+        data = await reader.read(game._state.__class__.buffersize())
+        if not data:
+            raise ConnectionError('connection closed')
+        return data.decode()
+
+    async def _play(self, game, players, number):
+        moves = []
+        winner = -1
+        framed = [False] * len(players)
+        peers = [None] * len(players)
+        try:
+            for i, (reader, writer) in enumerate(players):
+                await self._send(writer, 'START {}'.format(i))
+                data = (await self._receive(game, reader)).split(' ')
+                if data[0] != 'READY':
+                    raise ConnectionError('player {} not ready to start'.format(i))
+                framed[i] = FRAMED in data[1:]
+                peers[i] = game._peer(data[1:])
+            if self.__verbose:
+                print(' Game #{} started.'.format(number))
+            game._startgame()
+            while winner == -1:
+                current = game.currentplayer
+                reader, writer = players[current]
+                await self._send(writer, game._playmessage(peers[current]), framed[current])
+                start = time.monotonic()
+                move = await self._receive(game, reader, framed[current])
+                while move == RESYNC:
+                    peers[current]['since'] = None
+                    await self._send(writer, game._playmessage(peers[current]), framed[current])
+                    move = await self._receive(game, reader, framed[current])
+                elapsed = time.monotonic() - start
+                try:
+                    game._playmove(move)
+                    moves.append((current, move, elapsed))
+                except InvalidMoveException as e:
+                    await self._send(writer, 'ERROR {}'.format(e), framed[current])
+                winner = game._state.winner()
+            for i, (reader, writer) in enumerate(players):
+                await self._send(writer, 'END' if winner is None else 'WON' if winner == i else 'LOST', framed[i])
+            if self.__log is not None:
+                log = GameLog(self.__log)
+                log.start(game.name, players=game.nbplayers)
+                for current, move, elapsed in moves:
+                    log.move(current, move, elapsed)
+                log.end(winner=winner)
+                log.close()
+            if self.__verbose:
+                print(' Game #{} finished: {}.'.format(number, 'draw' if winner is None else
+                                                        'won by player {}'.format(winner)))
+        except (OSError, asyncio.IncompleteReadError) as e:
+            if self.__verbose:
+                print(' Game #{} abandoned: {}.'.format(number, e))
+            for (reader, writer), mode in zip(players, framed):
+                try:
+                    await self._send(writer, 'END', mode)
+                except OSError:
+                    pass
+        finally:
+            for reader, writer in players:
+                writer.close()
+            self.__finished += 1
+            if self.__maxgames is not None and self.__finished >= self.__maxgames:
+                self.__done.set()
+
+
 class GameClient(metaclass=ABCMeta):
     '''Abstract class representing a game client'''
-    def __init__(self, server, stateclass, verbose=False):
+    def __init__(self, server, stateclass, verbose=False, log=None, framed=True, compact=False, delta=False,
+                 name=None, nbplayers=None):
         self.__stateclass = stateclass
         self.__verbose = verbose
+        # Name of the game and number of players, as given to the GameServer, so that the log of the client matches
+        # the one of the server: without them, the log is named after the state class and its turns count the moves
+        # of the client only
+        self.__name = stateclass.__name__ if name is None else name
+        self.__nbplayers = nbplayers
+        # Ask the server for framed messages, compact states and moves instead of states (servers that do not know
+        # them keep sending unframed messages and JSON states). The COMPACT option needs a stateclass.decode reading
+        # the states of encode, and the DELTA option needs stateclass.applymove, whole states are asked for without it.
+        self.__framed = framed
+        self.__compact = compact
+        self.__delta = delta and hasattr(stateclass, 'applymove')
+        # State kept up to date with the moves received with the DELTA option
+        self.__state = None
+        # Path of a GameLog file where the moves of this player are recorded (optional)
+        self.__log = log
         if self.__verbose:
             _printsection('Starting game')
         addrinfos = socket.getaddrinfo(*server, socket.AF_INET, socket.SOCK_STREAM)
@@ -215,7 +576,7 @@ class GameClient(metaclass=ABCMeta):
             s.connect(addrinfos[0][4])
             if self.__verbose:
                 print(' Connected to the game server on {}:{}.'.format(*addrinfos[0][4]))
-            self.__server = s
+            self.__server = MessageStream(s, buffersize=stateclass.buffersize())
             self._gameloop()
         except OSError:
             print(' Impossible to connect to the game server on {}:{}.'.format(*addrinfos[0][4]))
@@ -223,27 +584,61 @@ class GameClient(metaclass=ABCMeta):
     def _gameloop(self):
         server = self.__server
         running = True
+        log = GameLog(self.__log) if self.__log is not None else None
+        # Number of the turn to play, and the last move sent while the server has not accepted it (it is logged
+        # once accepted, as an invalid move if it is rejected)
+        turn = None
+        pending = None
         while running:
-            data = server.recv(self.__stateclass.buffersize()).decode()
+            data = server.receive()
             command = data[:data.index(' ')] if ' ' in data else data
             if command == 'START':
                 self._playernb = int(data[data.index(' '):])
-                server.sendall('READY'.encode())
+                options = [option for option, wanted in ((FRAMED, self.__framed), (COMPACT, self.__compact),
+                                                         (DELTA, self.__delta)) if wanted]
+                server.send(' '.join(['READY'] + options))
+                if self.__framed:
+                    # The first message of the server tells whether it frames its messages
+                    server.framed = None
+                # The players play in turn and an invalid move does not change the turn
+                turn = self._playernb if self.__nbplayers is not None else None
+                if log is not None:
+                    log.start(self.__name, player=self._playernb)
                 if self.__verbose:
                     _printsection('Game started')
                     print("   Player's number: {}".format(self._playernb))
-            elif command == 'PLAY':
-                state = self.__stateclass.parse(data[data.index(' ')+1:])
+            elif command in ('PLAY', 'DELTA'):
+                if pending is not None:
+                    if log is not None:
+                        log.move(self._playernb, pending[0], pending[1], turn=turn, state=pending[2])
+                    if turn is not None:
+                        turn += self.__nbplayers
+                    pending = None
+                if command == 'PLAY':
+                    state = self.__stateclass.decode(data[data.index(' ')+1:])
+                else:
+                    state = self._applydelta(data[data.index(' ')+1:])
+                    if state is None:
+                        server.send(RESYNC)
+                        continue
+                self.__state = state
                 if self.__verbose:
                     print("\n=> Player's turn to play")
                     print('   State:')
                     state.prettyprint()
+                start = time.monotonic()
                 move = self._nextmove(state)
+                pending = move, time.monotonic() - start, json.loads(str(state)) if log is not None else None
                 if self.__verbose:
                     print('   Move:', move)
-                server.sendall(move.encode())
+                server.send(move)
             elif command in ('WON', 'LOST', 'END'):
                 running = False
+                if log is not None:
+                    if pending is not None:
+                        log.move(self._playernb, pending[0], pending[1], turn=turn, state=pending[2])
+                    log.end(result={'WON': 'won', 'LOST': 'lost', 'END': 'draw'}[command])
+                    log.close()
                 if self.__verbose:
                     _printsection('Game finished')
                     if command == 'WON':
@@ -255,10 +650,31 @@ class GameClient(metaclass=ABCMeta):
                     _printsection('Game ended')
                 server.close()
             else:
+                if command == 'ERROR' and pending is not None:
+                    # The move was rejected, the player plays the same turn again
+                    if log is not None:
+                        log.invalid(self._playernb, pending[0], data[len('ERROR '):], turn=turn)
+                    pending = None
                 if self.__verbose:
                     print('Specific data received:', data)
                 self._handle(data)
 
+    def _applydelta(self, data):
+        '''Apply the moves of a DELTA message to the state of the last turn and return it, or None if the state
+        does not match the checksum (or a move cannot be applied).'''
+        delta = json.loads(data)
+        state = self.__state
+        if state is None:
+            return None
+        try:
+            for move in delta['moves']:
+                state.applymove(move)
+        except InvalidMoveException:
+            return None
+        if delta['check'] is not None and state.checksum() != delta['check']:
+            return None
+        return state
+
     @abstractmethod
     def _handle(self, command):
         '''Handle a command.
@@ -0,0 +1,193 @@
+# mcts.py
+# Author: Elise Raxhon & Julien Beard
+# Version: October 18, 2026
+# -*- coding: utf-8 -*-
+
+from array import array
+import math
+import random
+import time
+
+import bitboard
+from geometry import MAXMOVES
+
+# NumPy is only needed for batch playouts
+try:
+    import numpy
+    import batch
+except ImportError:
+    numpy = batch = None
+
+# Exploration constant of the UCT formula
+EXPLORATION = 1.4
+# Maximum number of nodes kept in the arena, no node is expanded beyond it
+MAXNODES = 2000000
+
+
+def randommove(state, rand=random):
+    """Random legal move of the player to play on 'state', preferring moves that remove balls (None if there is
+    no legal move)"""
+    moves = list(state.legal_moves())
+    if not moves:
+        return None
+    removals = [move for move in moves if 'remove' in move]
+    return rand.choice(removals or moves)
+
+
+def playout(state, rand=random):
+    """Plays the random moves of randommove on 'state' until the end of the game and returns the winner, or None
+    if the game is still going on after MAXMOVES moves"""
+    for i in range(MAXMOVES):
+        winner = state.winner()
+        if winner != -1:
+            return winner
+        move = randommove(state, rand)
+        if move is None:
+            return 1 - state.turn
+        state.update(move, state.turn)
+    return None
+
+
+class MCTS:
+    '''Monte Carlo tree search (UCT) with random playouts.
+
+    The nodes live in flat arrays (an arena): node i has been reached with the move packed in move[i]
+    by player[i], its children are the nodes first[i] to first[i] + count[i] - 1 (first[i] is -1 while
+    it is not expanded), and wins[i] counts the playouts won by player[i] among visits[i].'''
+
+    def __init__(self, exploration=EXPLORATION, maxnodes=MAXNODES, iterations=None, rollouts=1, seed=None):
+        self.exploration = exploration
+        self.maxnodes = maxnodes
+        # Number of iterations per move, the time budget is used when it is None
+        self.iterations = iterations
+        # Number of playouts per iteration, simulated together with NumPy (batch.py) when there are several
+        self.rollouts = rollouts
+        self.nodes = 0
+        self.__random = random.Random(seed)
+        if rollouts > 1:
+            if batch is None:
+                raise ImportError('NumPy is needed for batch playouts')
+            self.__rng = numpy.random.default_rng(seed)
+        self.__state = None
+        self.__reset()
+
+    def __reset(self):
+        self.__move = array('i')
+        self.__player = array('b')
+        self.__first = array('i')
+        self.__count = array('i')
+        self.__visits = array('i')
+        self.__wins = array('d')
+
+    def __len__(self):
+        return len(self.__move)
+
+    def __newnode(self, move, player):
+        self.__move.append(move)
+        self.__player.append(player)
+        self.__first.append(-1)
+        self.__count.append(0)
+        self.__visits.append(0)
+        self.__wins.append(0.0)
+        return len(self.__move) - 1
+
+    def __expand(self, node, state):
+        moves = list(state.legal_moves())
+        if not moves or len(self) + len(moves) > self.maxnodes:
+            return False
+        self.__first[node] = len(self)
+        self.__count[node] = len(moves)
+        for move in moves:
+            self.__newnode(bitboard.encodemove(move), state.turn)
+        return True
+
+    def __select(self, node):
+        first = self.__first[node]
+        visits, wins = self.__visits, self.__wins
+        logparent = math.log(visits[node] + 1)
+        best, bestvalue = first, -1.0
+        for child in range(first, first + self.__count[node]):
+            if visits[child] == 0:
+                return child
+            value = wins[child] / visits[child] + self.exploration * math.sqrt(logparent / visits[child])
+            if value > bestvalue:
+                best, bestvalue = child, value
+        return best
+
+    def __bestchild(self, node):
+        first = self.__first[node]
+        return max(range(first, first + self.__count[node]), key=lambda child: self.__visits[child])
+
+    def __reroot(self, state):
+        """Keeps the subtree of the previous search whose position is 'state' (reached by our move and the
+        opponent's one), or starts a new tree"""
+        if self.__state is not None and self.__first[0] != -1:
+            previous = self.__state.copy()
+            ours = self.__bestchild(0)
+            previous.update(bitboard.decodemove(self.__move[ours]), previous.turn)
+            first = self.__first[ours]
+            for child in range(first, first + self.__count[ours]) if first != -1 else ():
+                record = previous.update(bitboard.decodemove(self.__move[child]), previous.turn)
+                if previous.key == state.key:
+                    self.__compact(child)
+                    self.__state = state.copy()
+                    return
+                previous.undo(record)
+        self.__reset()
+        self.__newnode(-1, 1 - state.turn)
+        self.__state = state.copy()
+
+    def __compact(self, root):
+        """Copies the subtree of 'root' in a new arena, breadth first so that children stay contiguous"""
+        old = (self.__move, self.__player, self.__first, self.__count, self.__visits, self.__wins)
+        self.__reset()
+        self.__newnode(old[0][root], old[1][root])
+        self.__visits[0], self.__wins[0] = old[4][root], old[5][root]
+        queue = [(root, 0)]
+        for source, target in queue:
+            first = old[2][source]
+            if first == -1:
+                continue
+            self.__first[target] = len(self)
+            self.__count[target] = old[3][source]
+            for child in range(first, first + old[3][source]):
+                new = self.__newnode(old[0][child], old[1][child])
+                self.__visits[new], self.__wins[new] = old[4][child], old[5][child]
+                queue.append((child, new))
+
+    def iterate(self, state, budget):
+        """Runs iterations from 'state' for 'budget' seconds (or self.iterations iterations) and returns
+        (win rate of the best move, [best move], number of iterations)"""
+        self.__reroot(state)
+        deadline = time.monotonic() + budget
+        iterations = self.iterations
+        self.nodes = 0
+        while (self.nodes < iterations) if iterations is not None else (time.monotonic() < deadline):
+            self.nodes += 1
+            current = state.copy()
+            path = [0]
+            node = 0
+            while self.__first[node] != -1 and current.winner() == -1:
+                node = self.__select(node)
+                current.update(bitboard.decodemove(self.__move[node]), current.turn)
+                path.append(node)
+            if current.winner() == -1 and self.__visits[node] > 0 and self.__expand(node, current):
+                node = self.__first[node] + self.__random.randrange(self.__count[node])
+                current.update(bitboard.decodemove(self.__move[node]), current.turn)
+                path.append(node)
+            if self.rollouts > 1:
+                wins = batch.playouts(current, self.rollouts, self.__rng)
+            else:
+                winner = playout(current, self.__random)
+                wins = (0.5, 0.5) if winner is None else (1 - winner, winner)
+            draws = (self.rollouts - wins[0] - wins[1]) / 2
+            for node in path:
+                self.__visits[node] += self.rollouts
+                self.__wins[node] += wins[self.__player[node]] + draws
+        if self.__first[0] == -1:
+            self.__expand(0, state)
+        if self.__first[0] == -1:
+            return None
+        best = self.__bestchild(0)
+        rate = self.__wins[best] / self.__visits[best] if self.__visits[best] else 0.0
+        return rate, [bitboard.decodemove(self.__move[best])], self.nodes
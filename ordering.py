@@ -0,0 +1,76 @@
+# ordering.py
+# Author: Elise Raxhon & Julien Beard
+# Version: October 18, 2026
+# -*- coding: utf-8 -*-
+
+import bitboard
+from geometry import CELLS, SQUARE_MASKS, popcount
+from search import MAXPLY
+import transposition
+
+NCELLS = len(CELLS)
+# Number of killer moves kept per ply
+KILLERS = 2
+
+
+def _blocks(opponent, to):
+    for square in SQUARE_MASKS[to]:
+        if popcount(opponent & square) == 3:
+            return True
+    return False
+
+
+class MoveOrdering:
+    '''Move ordering shared by the successive searches of an engine: the move from the transposition table or
+    the principal variation first, then by static priority, killer moves (moves that caused a cutoff at the same
+    ply) and history (how often and how deep a move from a cell to a cell caused a cutoff).'''
+
+    def __init__(self, killers=KILLERS):
+        self.killers = killers
+        self.clear()
+
+    def clear(self):
+        self.__killers = [[] for ply in range(MAXPLY)]
+        # history[source * NCELLS + to], with source NCELLS for a placement
+        self.__history = [0] * ((NCELLS + 1) * NCELLS)
+
+    def newsearch(self):
+        """Called at the start of each search: forgets the killers and ages the history"""
+        self.__killers = [[] for ply in range(MAXPLY)]
+        history = self.__history
+        for i in range(len(history)):
+            history[i] >>= 1
+
+    @staticmethod
+    def _index(code):
+        """Index in the history of a packed move (see bitboard.encodemove)"""
+        source = code >> 5 & 31
+        return (NCELLS if source == 31 else source) * NCELLS + (code & 31)
+
+    def order(self, state, moves, ply, bestcode=transposition.NOMOVE):
+        """Returns 'moves' sorted from the most to the least promising, the packed move 'bestcode' first"""
+        killers = self.__killers[ply] if ply < MAXPLY else ()
+        history = self.__history
+        opponent = state.boards[1 - state.turn]
+        blocks = {}
+
+        def key(move):
+            code = bitboard.encodemove(move)
+            to = code & 31
+            if to not in blocks:
+                blocks[to] = _blocks(opponent, to)
+            # Static priority: two points per ball removed (the move completes a square) and one point if the move
+            # fills a square where the opponent has three balls
+            static = 2 * len(move.get('remove', ())) + blocks[to]
+            return (code != bestcode, -static, code not in killers, -history[self._index(code)])
+        return sorted(moves, key=key)
+
+    def cutoff(self, move, ply, depth):
+        """Records that 'move' caused a beta cutoff at 'ply', 'depth' plies from the leaves"""
+        code = bitboard.encodemove(move)
+        if ply < MAXPLY:
+            killers = self.__killers[ply]
+            if code not in killers:
+                killers.insert(0, code)
+                del killers[self.killers:]
+        self.__history[self._index(code)] += depth * depth
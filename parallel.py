@@ -0,0 +1,120 @@
+# parallel.py
+# Author: Elise Raxhon & Julien Beard
+# Version: October 18, 2026
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ProcessPoolExecutor
+import time
+
+import bitboard
+import ordering
+import search
+import transposition
+
+# Search engine of a worker process, with its own transposition table kept between moves
+_engine = None
+# Evaluation function and table shared by all the workers of a LazySearch
+_evaluate = None
+_table = None
+
+
+def _initworker(evaluate, hashsize):
+    global _engine
+    _engine = search.Search(evaluate, transposition.TranspositionTable(hashsize), ordering=ordering.MoveOrdering())
+
+
+def _searchmove(packed, code, depth, deadline, alpha):
+    """Searches the root move 'code' of the packed state, returns (code, score, principal variation as codes)
+    with a score of None if the wall-clock 'deadline' is reached first. Scores not above 'alpha' are upper bounds."""
+    state = bitboard.PylosState.unpack(packed)
+    state.update(bitboard.decodemove(code), state.turn)
+    budget = None if deadline is None else max(deadline - time.time(), 0)
+    try:
+        score, pv = _engine.search(state, depth - 1, budget, -search.INFINITY, -alpha)
+    except search.SearchTimeout:
+        return code, None, []
+    return code, -score, [code] + [bitboard.encodemove(move) for move in pv]
+
+
+class RootSearch:
+    '''Iterative deepening where the moves of the root are searched in parallel by a pool of processes.'''
+
+    def __init__(self, workers, evaluate=search.reserve_delta, hashsize=16):
+        self.workers = workers
+        self.__executor = ProcessPoolExecutor(workers, initializer=_initworker, initargs=(evaluate, hashsize))
+
+    def close(self):
+        self.__executor.shutdown()
+
+    def iterate(self, state, budget, maxdepth=search.MAXDEPTH):
+        """Same as search.Search.iterate: returns (score, principal variation, depth) of the last depth for which
+        every root move was searched within 'budget' seconds"""
+        start = time.time()
+        packed = state.pack()
+        codes = [bitboard.encodemove(move) for move in state.legal_moves()]
+        if len(codes) == 0:
+            # A player who cannot play loses the game
+            return -search.WIN, [], 0
+        if len(codes) == 1:
+            return 0, [bitboard.decodemove(codes[0])], 0
+        deadline = None
+        result = None
+        for depth in range(1, maxdepth + 1):
+            # The first move is searched alone, the others only need to be compared with its score
+            code, score, line = self.__executor.submit(_searchmove, packed, codes[0], depth, deadline,
+                                                       -search.INFINITY).result()
+            if score is None:
+                break
+            scores = {code: (score, line)}
+            futures = [self.__executor.submit(_searchmove, packed, code, depth, deadline, score) for code in codes[1:]]
+            for future in futures:
+                code, score, line = future.result()
+                if score is not None:
+                    scores[code] = score, line
+            if len(scores) < len(codes):
+                break
+            # The next iteration searches the best moves of this one first
+            codes.sort(key=lambda code: -scores[code][0])
+            score, line = scores[codes[0]]
+            result = score, [bitboard.decodemove(code) for code in line], depth
+            deadline = start + budget
+            if abs(score) > search.WIN - search.MAXPLY or time.time() >= deadline:
+                break
+        return result
+
+
+def _initlazy(evaluate, name):
+    global _evaluate, _table
+    _evaluate = evaluate
+    _table = transposition.SharedTranspositionTable(name=name)
+
+
+def _lazyiterate(packed, budget, maxdepth, helper):
+    """Iterative deepening of the packed state with the shared table, moves are shuffled unless 'helper' is 0.
+    Returns (score, principal variation as codes, depth, helper)."""
+    engine = search.Search(_evaluate, _table, seed=helper if helper > 0 else None, ordering=ordering.MoveOrdering())
+    score, pv, depth = engine.iterate(bitboard.PylosState.unpack(packed), budget, maxdepth)
+    return score, [bitboard.encodemove(move) for move in pv], depth, helper
+
+
+class LazySearch:
+    '''Lazy SMP: several processes search the same position, each in a slightly different order,
+    and share what they find through a SharedTranspositionTable.'''
+
+    def __init__(self, workers, evaluate=search.reserve_delta, hashsize=16):
+        self.workers = workers
+        self.__table = transposition.SharedTranspositionTable(hashsize)
+        self.__executor = ProcessPoolExecutor(workers, initializer=_initlazy, initargs=(evaluate, self.__table.name))
+
+    def close(self):
+        self.__executor.shutdown()
+        self.__table.close()
+
+    def iterate(self, state, budget, maxdepth=search.MAXDEPTH):
+        """Same as search.Search.iterate, the result is the one of the worker that went the deepest"""
+        packed = state.pack()
+        futures = [self.__executor.submit(_lazyiterate, packed, budget, maxdepth, helper)
+                   for helper in range(self.workers)]
+        results = [future.result() for future in futures]
+        score, line, depth, helper = max(results, key=lambda result: (result[2], -result[3]))
+        return score, [bitboard.decodemove(code) for code in line], depth
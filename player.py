@@ -0,0 +1,57 @@
+# player.py
+# Author: Elise Raxhon & Julien Beard
+# Version: October 18, 2026
+# -*- coding: utf-8 -*-
+
+import evaluation
+import mcts
+import ordering
+import parallel
+import search
+import transposition
+
+# Time budget of the search of each move, in seconds
+BUDGET = 1.0
+STRATEGIES = ('alphabeta', 'root', 'smp', 'mcts')
+
+
+class Player:
+    '''Chooses the moves of a Pylos player: from the opening book, then the tablebase, then the search engine.
+    It does not depend on the network, PylosClient plays through it and the arena uses it directly.'''
+
+    def __init__(self, hashsize=16, budget=BUDGET, strategy='alphabeta', workers=1, iterations=None, rollouts=1,
+                 tablebase=None, book=None, evaluate=None):
+        self.budget = budget
+        self.tablebase = tablebase
+        self.book = book
+        if evaluate is None:
+            evaluate = evaluation.Evaluation()
+        if strategy == 'mcts':
+            self.engine = mcts.MCTS(iterations=iterations, rollouts=rollouts)
+        elif strategy == 'root':
+            self.engine = parallel.RootSearch(workers, evaluate, hashsize)
+        elif strategy == 'smp':
+            self.engine = parallel.LazySearch(workers, evaluate, hashsize)
+        elif strategy == 'alphabeta':
+            self.engine = search.Search(evaluate, transposition.TranspositionTable(hashsize),
+                                        ordering=ordering.MoveOrdering())
+        else:
+            raise ValueError('unknown strategy: {}'.format(strategy))
+
+    def close(self):
+        """Stops the worker processes of the engine, if any"""
+        if hasattr(self.engine, 'close'):
+            self.engine.close()
+
+    def nextmove(self, state):
+        """Returns the move (as a dictionary) to play in the bitboard PylosState 'state'"""
+        if self.book is not None:
+            move = self.book.bestmove(state)
+            if move is not None:
+                return move
+        if self.tablebase is not None:
+            move = self.tablebase.bestmove(state)
+            if move is not None:
+                return move
+        score, pv, depth = self.engine.iterate(state, self.budget)
+        return pv[0]
@@ -0,0 +1,207 @@
+# records.py
+# Author: Elise Raxhon & Julien Beard
+# Version: October 18, 2026
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import re
+
+import bitboard
+from geometry import CELLS, popcount
+from lib import game
+
+_ROW = re.compile(r'^\|((?:[_@O]\|)+)$')
+_BALLS = {'_': None, '@': 0, 'O': 1}
+_RESULTS = {'You won the game.': 'won', 'You lost the game.': 'lost', 'It is draw.': 'draw'}
+
+
+def games(path):
+    """Generates the games of a log written by the server or a client (--log), see lib.game.GameLog"""
+    return game.readlog(path)
+
+
+def load(path):
+    """Generates the games of a log or of a verbose client output (see transcript), recognised by their first line"""
+    with open(path) as file:
+        first = next((line for line in file if line.strip()), '')
+    return games(path) if first.startswith('{') else transcript(path)
+
+
+def result(record, player):
+    """Result of the game for 'player': 1 if won, 0 if lost, 0.5 for a draw, None if the game was interrupted"""
+    end = record['end']
+    if end is None:
+        return None
+    if 'result' in end:
+        # Log of a client, only its own result is known
+        if record['start'].get('player') != player:
+            return {'won': 0, 'lost': 1, 'draw': 0.5}[end['result']]
+        return {'won': 1, 'lost': 0, 'draw': 0.5}[end['result']]
+    if end['winner'] is None:
+        return 0.5
+    return 1 if end['winner'] == player else 0
+
+
+def replay(record):
+    """Generates (state, move) for each move of a game, the bitboard PylosState being the position before the move.
+    Moves of a server log are checked by playing them from the initial position, moves of a client log (which
+    only holds the moves of the client) are played from the state recorded with them.
+    Raises game.InvalidMoveException if a move is not legal."""
+    state = bitboard.PylosState()
+    for entry in record['moves']:
+        if 'state' in entry:
+            state = bitboard.PylosState(entry['state'])
+        if entry['player'] != state.turn:
+            raise game.InvalidMoveException('turn {}: player {} played instead of player {}'
+                                            .format(entry['turn'], entry['player'], state.turn))
+        move = json.loads(entry['move'])
+        yield state.copy(), move
+        state.update(move, state.turn)
+
+
+def _parsestate(lines):
+    """Builds a bitboard PylosState from the lines printed by prettyprint, or returns None if they are garbled"""
+    cells = []
+    reserve = [None, None]
+    turn = None
+    for i, line in enumerate(lines):
+        match = _ROW.match(line.strip())
+        if match:
+            cells.extend(_BALLS[ball] for ball in match.group(1)[:-1].split('|'))
+        elif line.startswith('Reserve of ') and i + 1 < len(lines):
+            reserve[0 if 'Light' in line else 1] = len(lines[i + 1].split())
+        elif line.endswith('to play !'):
+            turn = 0 if line.startswith('Light') else 1
+    if len(cells) != len(CELLS) or None in reserve or turn is None:
+        return None
+    boards = [0, 0]
+    for i, ball in enumerate(cells):
+        if ball is not None:
+            boards[ball] |= 1 << i
+    # Every ball of a player is either on the board or in its reserve
+    if any(popcount(boards[player]) + reserve[player] != 15 for player in (0, 1)):
+        return None
+    return bitboard.PylosState.unpack((boards[0], boards[1], reserve[0], reserve[1], turn))
+
+
+def _between(before, after):
+    """Returns a move leading from the state 'before' to the state 'after', or None"""
+    target = after.pack()
+    for move in before.legal_moves():
+        record = before.update(move, before.turn)
+        found = before.pack() == target
+        before.undo(record)
+        if found:
+            return move
+    return None
+
+
+def transcript(path):
+    """Reads the output of a verbose client (GameClient._gameloop and prettyprint, several games may follow each
+    other) line by line and generates its games in the format of readlog, like the log of the client. Each move
+    of the client is checked by playing it on the state printed before it; the moves of the opponent, which are not
+    printed, are found back from the state after the client's move and the next printed state. Moves that cannot
+    be checked or found back are left out."""
+    record = None
+    block = None
+    state = None
+    after = None
+
+    def add(state, move):
+        record['moves'].append({'type': 'move', 'turn': len(record['moves']), 'player': state.turn,
+                                'move': json.dumps(move), 'elapsed': None, 'state': state.visible()})
+
+    with open(path) as file:
+        for line in file:
+            line = line.rstrip('\n')
+            stripped = line.strip()
+            if 'Starting game' in line:
+                if record is not None:
+                    yield record
+                record = {'start': {'type': 'start', 'game': 'Pylos', 'source': path}, 'moves': [], 'end': None}
+                state = after = None
+            elif record is None:
+                continue
+            elif stripped.startswith("Player's number:"):
+                record['start']['player'] = int(stripped.split(':')[1])
+            elif stripped == 'State:':
+                block = []
+            elif block is not None:
+                block.append(line)
+                if line.endswith('to play !'):
+                    state = _parsestate(block)
+                    block = None
+                    if state is not None and after is not None:
+                        move = _between(after, state)
+                        if move is not None:
+                            add(after, move)
+                    after = None
+            elif stripped.startswith('Move:') and state is not None:
+                try:
+                    move = json.loads(stripped[len('Move:'):])
+                    after = state.copy()
+                    after.update(move, after.turn)
+                    add(state, move)
+                except (ValueError, game.InvalidMoveException):
+                    after = None
+                state = None
+            elif stripped in _RESULTS:
+                record['end'] = {'type': 'end', 'result': _RESULTS[stripped]}
+                yield record
+                record = None
+    if record is not None:
+        yield record
+
+
+def write(path, records):
+    """Appends games in the format of readlog to a log file, returns the number of games"""
+    log = game.GameLog(path)
+    count = 0
+    try:
+        for record in records:
+            start = record['start']
+            log.start(start['game'], **{key: value for key, value in start.items()
+                                        if key not in ('type', 'game', 'time')})
+            for entry in record['moves']:
+                log.move(entry['player'], entry['move'], entry['elapsed'], turn=entry['turn'],
+                         **{key: value for key, value in entry.items()
+                            if key not in ('type', 'turn', 'player', 'move', 'elapsed')})
+            if record['end'] is not None:
+                log.end(**{key: value for key, value in record['end'].items() if key != 'type'})
+            count += 1
+    finally:
+        log.close()
+    return count
+
+
+def _outcome(end):
+    if end is None:
+        return 'interrupted'
+    if 'result' in end:
+        return end['result']
+    return 'draw' if end['winner'] is None else 'won by player {}'.format(end['winner'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Pylos game records')
+    subparsers = parser.add_subparsers(description='summary import', help='actions on the records', dest='action')
+    summary_parser = subparsers.add_parser('summary', help='replay and summarize games')
+    summary_parser.add_argument('paths', nargs='+', help='files written with --log or outputs of verbose clients')
+    import_parser = subparsers.add_parser('import', help='convert outputs of verbose clients to a log')
+    import_parser.add_argument('transcripts', nargs='+', help='outputs of verbose clients')
+    import_parser.add_argument('--output', help='log file to append the games to', required=True)
+    args = parser.parse_args()
+    if args.action == 'import':
+        for path in args.transcripts:
+            print('{}: {} games'.format(path, write(args.output, transcript(path))))
+    elif args.action == 'summary':
+        for path in args.paths:
+            for number, record in enumerate(load(path)):
+                moves = sum(1 for state, move in replay(record))
+                elapsed = [entry['elapsed'] for entry in record['moves'] if entry['elapsed'] is not None]
+                print('{} #{}: {} moves{}, {}'.format(
+                    path, number, moves, ', {:.3f} s per move'.format(sum(elapsed) / len(elapsed)) if elapsed else '',
+                    _outcome(record['end'])))
+    else:
+        parser.print_help()
@@ -0,0 +1,171 @@
+# search.py
+# Author: Elise Raxhon & Julien Beard
+# Version: October 18, 2026
+# -*- coding: utf-8 -*-
+
+import random
+import time
+
+import bitboard
+import transposition
+
+INFINITY = 1000000
+# Score of a won game, minus the number of plies needed to win it
+WIN = 100000
+MAXPLY = 1000
+# Deepest iteration of the iterative deepening
+MAXDEPTH = 64
+
+
+class SearchTimeout(Exception):
+    '''Exception raised inside the search when the time budget is spent.'''
+    pass
+
+
+def reserve_delta(state):
+    """Difference between the reserves of the player to play and of the opponent"""
+    reserve = state.reserve
+    return reserve[state.turn] - reserve[1 - state.turn]
+
+
+class Search:
+    '''Negamax search with alpha-beta pruning, played in place on a bitboard PylosState.'''
+
+    def __init__(self, evaluate=reserve_delta, table=None, seed=None, ordering=None):
+        self.evaluate = evaluate
+        self.table = table
+        # Move ordering heuristics (ordering.MoveOrdering), without them only the best move of the transposition
+        # table or of the previous iteration is tried first
+        self.ordering = ordering
+        # With a seed, moves are shuffled before being ordered so that several searches explore in different orders
+        self._random = None if seed is None else random.Random(seed)
+        self.nodes = 0
+        self.deadline = None
+        self._previous = []
+
+    def search(self, state, depth, budget=None, alpha=-INFINITY, beta=INFINITY):
+        """Returns the score of 'state' for the player to play and the principal variation (list of moves).
+        Scores outside of the (alpha, beta) window are only bounds.
+        Raises SearchTimeout if 'budget' seconds are spent before the end of the search."""
+        self.nodes = 0
+        self.deadline = None if budget is None else time.monotonic() + budget
+        self._previous = []
+        if self.table is not None:
+            self.table.newsearch()
+        if self.ordering is not None:
+            self.ordering.newsearch()
+        return self._negamax(state, depth, alpha, beta, 0)
+
+    def iterate(self, state, budget, maxdepth=MAXDEPTH):
+        """Iterative deepening: searches 'state' 1, 2, 3... plies deep until 'budget' seconds are spent and returns
+        (score, principal variation, depth) of the last completed iteration. Each iteration tries the principal
+        variation of the previous one first. The first iteration is always completed."""
+        start = time.monotonic()
+        self.nodes = 0
+        self.deadline = None
+        self._previous = []
+        if self.table is not None:
+            self.table.newsearch()
+        if self.ordering is not None:
+            self.ordering.newsearch()
+        result = None
+        for depth in range(1, maxdepth + 1):
+            try:
+                score, pv = self._negamax(state.copy(), depth, -INFINITY, INFINITY, 0, True)
+            except SearchTimeout:
+                break
+            result = score, pv, depth
+            self._previous = pv
+            self.deadline = start + budget
+            if abs(score) > WIN - MAXPLY or time.monotonic() >= self.deadline:
+                break
+        return result
+
+    def _negamax(self, state, depth, alpha, beta, ply, onpv=False):
+        self.nodes += 1
+        if self.deadline is not None and self.nodes & 255 == 0 and time.monotonic() > self.deadline:
+            raise SearchTimeout()
+        winner = state.winner()
+        if winner != -1:
+            return (WIN - ply if winner == state.turn else ply - WIN), []
+        if depth == 0:
+            return self.evaluate(state), []
+
+        table = self.table
+        bestcode = transposition.NOMOVE
+        if table is not None:
+            entry = table.probe(state.key)
+            if entry is not None:
+                entrydepth, flag, score, bestcode = entry
+                score = _fromtable(score, ply)
+                if entrydepth >= depth and ply > 0:
+                    line = [] if bestcode == transposition.NOMOVE else [bitboard.decodemove(bestcode)]
+                    if flag == transposition.EXACT:
+                        return score, line
+                    if flag == transposition.LOWERBOUND and score >= beta:
+                        return score, line
+                    if flag == transposition.UPPERBOUND and score <= alpha:
+                        return score, line
+
+        moves = list(state.legal_moves())
+        if not moves:
+            # A player who cannot play loses the game
+            return ply - WIN, []
+        if self._random is not None:
+            self._random.shuffle(moves)
+        onpv = onpv and ply < len(self._previous)
+        if onpv:
+            bestcode = bitboard.encodemove(self._previous[ply])
+        if self.ordering is not None:
+            moves = self.ordering.order(state, moves, ply, bestcode)
+        elif bestcode != transposition.NOMOVE:
+            moves.sort(key=lambda move: bitboard.encodemove(move) != bestcode)
+        if bestcode != transposition.NOMOVE:
+            onpv = onpv and bitboard.encodemove(moves[0]) == bestcode
+
+        player = state.turn
+        alphaorig = alpha
+        best = -INFINITY
+        pv = []
+        for move in moves:
+            record = state.update(move, player)
+            score, line = self._negamax(state, depth - 1, -beta, -alpha, ply + 1, onpv)
+            state.undo(record)
+            onpv = False
+            score = -score
+            if score > best:
+                best = score
+                pv = [move] + line
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if self.ordering is not None:
+                            self.ordering.cutoff(move, ply, depth)
+                        break
+
+        if table is not None:
+            if best <= alphaorig:
+                flag = transposition.UPPERBOUND
+            elif best >= beta:
+                flag = transposition.LOWERBOUND
+            else:
+                flag = transposition.EXACT
+            table.store(state.key, depth, flag, _totable(best, ply), bitboard.encodemove(pv[0]))
+        return best, pv
+
+
+def _totable(score, ply):
+    """Stores won/lost scores relatively to the position rather than to the root"""
+    if score > WIN - MAXPLY:
+        return score + ply
+    if score < MAXPLY - WIN:
+        return score - ply
+    return score
+
+
+def _fromtable(score, ply):
+    if score > WIN - MAXPLY:
+        return score - ply
+    if score < MAXPLY - WIN:
+        return score + ply
+    return score
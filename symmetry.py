@@ -0,0 +1,64 @@
+# symmetry.py
+# Author: Elise Raxhon & Julien Beard
+# Version: October 18, 2026
+# -*- coding: utf-8 -*-
+
+import bitboard
+from geometry import CELLS, INDEX
+
+# The 8 symmetries of the pyramid (rotations and reflections around its vertical axis), as functions of the
+# row and column of a cell on a layer of size n
+_TRANSFORMS = [
+    lambda row, column, n: (row, column),
+    lambda row, column, n: (column, n - 1 - row),
+    lambda row, column, n: (n - 1 - row, n - 1 - column),
+    lambda row, column, n: (n - 1 - column, row),
+    lambda row, column, n: (row, n - 1 - column),
+    lambda row, column, n: (column, row),
+    lambda row, column, n: (n - 1 - row, column),
+    lambda row, column, n: (n - 1 - column, n - 1 - row),
+]
+
+# PERMUTATIONS[t][i]: the cell where symmetry t sends cell i
+PERMUTATIONS = [tuple(INDEX[(layer,) + transform(row, column, 4 - layer)] for layer, row, column in CELLS)
+                for transform in _TRANSFORMS]
+# INVERSE[t]: the symmetry undoing t
+INVERSE = [next(u for u in range(len(PERMUTATIONS))
+                if all(PERMUTATIONS[u][PERMUTATIONS[t][i]] == i for i in range(len(CELLS))))
+           for t in range(len(PERMUTATIONS))]
+
+# _CHUNKS[t][k][byte]: image by symmetry t of the mask made of 'byte' shifted by 8 * k bits
+_CHUNKS = [[[sum(1 << permutation[8 * k + bit] for bit in range(8) if byte >> bit & 1 and 8 * k + bit < len(CELLS))
+             for byte in range(256)] for k in range(4)] for permutation in PERMUTATIONS]
+
+
+def transformmask(mask, t):
+    """Image of a mask of cells by symmetry t"""
+    chunks = _CHUNKS[t]
+    return chunks[0][mask & 255] | chunks[1][mask >> 8 & 255] | chunks[2][mask >> 16 & 255] | chunks[3][mask >> 24]
+
+
+def transformstate(state, t):
+    """Image of a bitboard PylosState by symmetry t"""
+    b0, b1, r0, r1, turn = state.pack()
+    return bitboard.PylosState.unpack((transformmask(b0, t), transformmask(b1, t), r0, r1, turn))
+
+
+def transformmove(move, t):
+    """Image of a move by symmetry t"""
+    permutation = PERMUTATIONS[t]
+    cell = lambda coord: list(CELLS[permutation[INDEX[tuple(coord)]]])
+    result = dict(move, to=cell(move['to']))
+    if 'from' in move:
+        result['from'] = cell(move['from'])
+    if 'remove' in move:
+        result['remove'] = [cell(coord) for coord in move['remove']]
+    return result
+
+
+def canonical(state):
+    """Returns (key, t): symmetry t sends 'state' to its canonical orientation (the one with the smallest boards)
+    and key is the Zobrist key of the state in that orientation, the same for the 8 symmetric states"""
+    b0, b1 = state.boards
+    best = min(range(len(PERMUTATIONS)), key=lambda t: (transformmask(b0, t), transformmask(b1, t)))
+    return transformstate(state, best).key, best
@@ -0,0 +1,217 @@
+# tablebase.py
+# Author: Elise Raxhon & Julien Beard
+# Version: October 18, 2026
+# -*- coding: utf-8 -*-
+
+import argparse
+from collections import deque
+import mmap
+import random
+import struct
+
+import bitboard
+import mcts
+import symmetry
+
+# Positions are stored under their canonical key (see symmetry.canonical), symmetric positions having the same
+# value. Values stored for a position, from the point of view of the player to play:
+#   n > 0: won, the game ends n - 1 plies later with best play;
+#   n < 0: lost, the game ends -n - 1 plies later with best play;
+#   0: drawn or not solved (a move leaves the tablebase or the game loops).
+UNKNOWN = 0
+MAXVALUE = 127
+DEFAULT_EMPTY = 4
+
+MAGIC = b'PYTB'
+HEADER = struct.Struct('<4sIIII')
+MASK64 = (1 << 64) - 1
+
+
+def empty(state):
+    """Number of empty cells: every ball of a player is either on the board or in its reserve"""
+    reserve = state.reserve
+    return reserve[0] + reserve[1]
+
+
+def _bucket(key, buckets):
+    return (key >> 40) % buckets
+
+
+def _slot(key, displacement, slots):
+    mixed = ((key ^ displacement * 0x9E3779B97F4A7C15) & MASK64) * 0xBF58476D1CE4E5B9 & MASK64
+    return (mixed >> 32) % slots
+
+
+def randomgames(count, maxempty, seed=None):
+    """Plays 'count' random games (with the moves of mcts.randommove) and returns the positions met with at most
+    'maxempty' empty cells"""
+    rand = random.Random(seed)
+    positions = {}
+    for i in range(count):
+        state = bitboard.PylosState()
+        while state.winner() == -1:
+            move = mcts.randommove(state, rand)
+            if move is None:
+                break
+            state.update(move, state.turn)
+            if empty(state) <= maxempty:
+                positions.setdefault(symmetry.canonical(state)[0], state.copy())
+    return list(positions.values())
+
+
+def generate(seeds, maxempty=DEFAULT_EMPTY):
+    """Solves by retrograde analysis every position with at most 'maxempty' empty cells reachable from the 'seeds'
+    states, returns a dictionary {key: value}"""
+    states = {}
+    for state in seeds:
+        if empty(state) <= maxempty:
+            states[symmetry.canonical(state)[0]] = state
+    # Closure of the seeds, counting for each position its successors (those outside of the tablebase never get
+    # a value) and recording its predecessors
+    predecessors = {}
+    remaining = {}
+    queue = deque(states.items())
+    solved = deque()
+    values = {}
+    while queue:
+        key, state = queue.popleft()
+        winner = state.winner()
+        if winner != -1:
+            values[key] = 1 if winner == state.turn else -1
+            solved.append(key)
+            continue
+        successors = set()
+        for move in state.legal_moves():
+            child = state.copy()
+            child.update(move, child.turn)
+            childkey = symmetry.canonical(child)[0]
+            if childkey in successors:
+                continue
+            successors.add(childkey)
+            if empty(child) <= maxempty:
+                predecessors.setdefault(childkey, []).append(key)
+                if childkey not in states:
+                    states[childkey] = child
+                    queue.append((childkey, child))
+        if not successors:
+            # A player who cannot play loses
+            values[key] = -1
+            solved.append(key)
+        remaining[key] = len(successors)
+
+    # Retrograde analysis, in increasing distance to the end of the game
+    while solved:
+        key = solved.popleft()
+        value = values[key]
+        for parent in predecessors.get(key, ()):
+            if parent in values:
+                continue
+            if value < 0:
+                values[parent] = min(-value + 1, MAXVALUE)
+                solved.append(parent)
+            else:
+                remaining[parent] -= 1
+                if remaining[parent] == 0:
+                    values[parent] = max(-value - 1, -MAXVALUE)
+                    solved.append(parent)
+    return {key: values.get(key, UNKNOWN) for key in states}
+
+
+def write(path, values, maxempty=DEFAULT_EMPTY):
+    """Writes the {key: value} dictionary as a tablebase file, indexed by a perfect hash of the keys
+    (hash and displace: the keys of each bucket are moved together until none of them collides)"""
+    keys = list(values)
+    slots = max(1, len(keys) + len(keys) // 8)
+    buckets = max(1, len(keys) // 4)
+    contents = [[] for i in range(buckets)]
+    for key in keys:
+        contents[_bucket(key, buckets)].append(key)
+    displacements = [0] * buckets
+    table = [None] * slots
+    for bucket in sorted(range(buckets), key=lambda bucket: -len(contents[bucket])):
+        if not contents[bucket]:
+            continue
+        displacement = 0
+        while True:
+            positions = {_slot(key, displacement, slots) for key in contents[bucket]}
+            if len(positions) == len(contents[bucket]) and all(table[i] is None for i in positions):
+                break
+            displacement += 1
+        displacements[bucket] = displacement
+        for key in contents[bucket]:
+            table[_slot(key, displacement, slots)] = key
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, 1, slots, buckets, maxempty))
+        file.write(struct.pack('<{}I'.format(buckets), *displacements))
+        file.write(bytes(-file.tell() % 8))
+        file.write(struct.pack('<{}Q'.format(slots), *(0 if key is None else key for key in table)))
+        file.write(struct.pack('<{}b'.format(slots), *(0 if key is None else values[key] for key in table)))
+
+
+class Tablebase:
+    '''Tablebase file mapped in memory, looked up in constant time. Only positions with at most 'maxempty'
+    empty cells can be in it.'''
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.__slots, self.__buckets, self.maxempty = HEADER.unpack_from(self.__map)
+        if magic != MAGIC:
+            raise ValueError('{} is not a tablebase file'.format(path))
+        view = memoryview(self.__map)
+        offset = HEADER.size
+        self.__displacements = view[offset:offset + 4 * self.__buckets].cast('I')
+        offset += 4 * self.__buckets
+        offset += -offset % 8
+        self.__keys = view[offset:offset + 8 * self.__slots].cast('Q')
+        offset += 8 * self.__slots
+        self.__values = view[offset:offset + self.__slots].cast('b')
+
+    def __len__(self):
+        return self.__slots
+
+    def close(self):
+        for view in (self.__displacements, self.__keys, self.__values):
+            view.release()
+        self.__map.close()
+
+    def probe(self, state):
+        """Returns the value of 'state' or None if it is not in the tablebase"""
+        if empty(state) > self.maxempty:
+            return None
+        key = symmetry.canonical(state)[0]
+        i = _slot(key, self.__displacements[_bucket(key, self.__buckets)], self.__slots)
+        if self.__keys[i] != key:
+            return None
+        return self.__values[i]
+
+    def bestmove(self, state):
+        """Returns the move keeping the best value of 'state' (fastest win or slowest loss), or None if the
+        position is not solved"""
+        value = self.probe(state)
+        if value is None or value == UNKNOWN:
+            return None
+        for move in state.legal_moves():
+            record = state.update(move, state.turn)
+            child = self.probe(state)
+            state.undo(record)
+            if child is not None and child != UNKNOWN and (child < 0 and -child + 1 == value or
+                                                           child > 0 and -child - 1 == value):
+                return move
+        return None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Pylos endgame tablebase generator')
+    parser.add_argument('path', help='tablebase file to write')
+    parser.add_argument('--empty', help='maximum number of empty cells (default: {})'.format(DEFAULT_EMPTY),
+                        type=int, default=DEFAULT_EMPTY)
+    parser.add_argument('--games', help='number of random games giving the seed positions (default: 1000)',
+                        type=int, default=1000)
+    parser.add_argument('--seed', help='seed of the random games', type=int)
+    args = parser.parse_args()
+    values = generate(randomgames(args.games, args.empty, args.seed), args.empty)
+    write(args.path, values, args.empty)
+    print('{} positions: {} won, {} lost, {} not solved'.format(
+        len(values), sum(value > 0 for value in values.values()), sum(value < 0 for value in values.values()),
+        sum(value == UNKNOWN for value in values.values())))
@@ -0,0 +1,166 @@
+# transposition.py
+# Author: Elise Raxhon & Julien Beard
+# Version: October 18, 2026
+# -*- coding: utf-8 -*-
+
+from array import array
+from multiprocessing import shared_memory
+
+# Kind of score stored in an entry
+EXACT = 0
+LOWERBOUND = 1
+UPPERBOUND = 2
+
+# Bytes used by one entry: key (8), score (4), move (4), depth (1), flag (1), generation (1)
+ENTRY_SIZE = 19
+
+NOMOVE = -1
+
+
+class TranspositionTable:
+    '''Fixed-size table of searched positions, indexed by their Zobrist key.
+
+    Each bucket has two slots: the first one keeps the deepest result of the current search
+    and the second one is always replaced.'''
+
+    def __init__(self, megabytes=16):
+        buckets = 1
+        while buckets * 4 * ENTRY_SIZE <= megabytes * 1024 * 1024:
+            buckets *= 2
+        self.__mask = buckets - 1
+        size = 2 * buckets
+        self.__keys = array('Q', bytes(8 * size))
+        self.__scores = array('i', bytes(4 * size))
+        self.__moves = array('i', [NOMOVE]) * size
+        self.__depths = array('b', [-1]) * size
+        self.__flags = array('B', bytes(size))
+        self.__generations = array('B', bytes(size))
+        self.__generation = 0
+
+    def __len__(self):
+        return len(self.__keys)
+
+    def newsearch(self):
+        """Marks the entries stored so far as older than the ones of the next search"""
+        self.__generation = (self.__generation + 1) % 256
+
+    def clear(self):
+        for i in range(len(self.__keys)):
+            self.__keys[i] = 0
+            self.__depths[i] = -1
+            self.__moves[i] = NOMOVE
+
+    def probe(self, key):
+        """Returns (depth, flag, score, move) stored for 'key', or None if the position is not in the table"""
+        slot = (key & self.__mask) * 2
+        for i in (slot, slot + 1):
+            if self.__keys[i] == key and self.__depths[i] >= 0:
+                return self.__depths[i], self.__flags[i], self.__scores[i], self.__moves[i]
+        return None
+
+    def store(self, key, depth, flag, score, move=NOMOVE):
+        """Records the result of a search of 'depth' plies ('move' is a move packed by bitboard.encodemove)"""
+        slot = (key & self.__mask) * 2
+        if (
+            self.__keys[slot] == key or
+            depth >= self.__depths[slot] or
+            self.__generations[slot] != self.__generation
+        ):
+            i = slot
+            if self.__keys[slot] != key and self.__depths[slot] >= 0:
+                # Keep the entry pushed out of the depth-preferred slot in the always-replace one
+                self.__write(slot + 1, self.__keys[slot], self.__depths[slot], self.__flags[slot],
+                             self.__scores[slot], self.__moves[slot], self.__generations[slot])
+        else:
+            i = slot + 1
+        if move == NOMOVE and self.__keys[i] == key:
+            move = self.__moves[i]
+        self.__write(i, key, depth, flag, score, move, self.__generation)
+
+    def __write(self, i, key, depth, flag, score, move, generation):
+        self.__keys[i] = key
+        self.__depths[i] = depth
+        self.__flags[i] = flag
+        self.__scores[i] = score
+        self.__moves[i] = move
+        self.__generations[i] = generation
+
+
+class SharedTranspositionTable:
+    '''Transposition table held in a multiprocessing.shared_memory block, shared by several processes.
+
+    Each entry is two 64-bit words: the data (score, move, depth, flag and generation packed together)
+    and the key xor the data, so that an entry torn by two concurrent writes is seen as a miss.
+    The process that creates the table owns it; the others attach to it with its name.'''
+
+    def __init__(self, megabytes=16, name=None):
+        if name is None:
+            buckets = 1
+            while buckets * 4 * 16 <= megabytes * 1024 * 1024:
+                buckets *= 2
+            self.__memory = shared_memory.SharedMemory(create=True, size=buckets * 2 * 16)
+            self.__owner = True
+        else:
+            self.__memory = shared_memory.SharedMemory(name=name)
+            self.__owner = False
+        self.__words = self.__memory.buf.cast('Q')
+        self.__mask = len(self.__words) // 4 - 1
+        self.__generation = 0
+
+    @property
+    def name(self):
+        return self.__memory.name
+
+    def __len__(self):
+        return len(self.__words) // 2
+
+    def close(self):
+        """Detaches from the shared block, and frees it if this table created it"""
+        self.__words.release()
+        self.__memory.close()
+        if self.__owner:
+            self.__memory.unlink()
+
+    def newsearch(self):
+        self.__generation = (self.__generation + 1) % 256
+
+    def clear(self):
+        for i in range(len(self.__words)):
+            self.__words[i] = 0
+
+    def __read(self, i):
+        """Returns (key, depth, flag, score, move, generation) of entry i, or None if it is empty or torn"""
+        data = self.__words[2 * i]
+        check = self.__words[2 * i + 1]
+        if data == 0:
+            return None
+        return (check ^ data, (data >> 45 & 0xFF) - 1, data >> 53 & 3, (data & 0xFFFFFF) - (1 << 23),
+                (data >> 24 & 0x1FFFFF) - 1, data >> 55 & 0xFF)
+
+    def __write(self, i, key, depth, flag, score, move, generation):
+        data = ((score + (1 << 23)) | (move + 1) << 24 | (depth + 1) << 45 | flag << 53 | generation << 55)
+        self.__words[2 * i] = data
+        self.__words[2 * i + 1] = key ^ data
+
+    def probe(self, key):
+        slot = (key & self.__mask) * 2
+        for i in (slot, slot + 1):
+            entry = self.__read(i)
+            if entry is not None and entry[0] == key:
+                return entry[1], entry[2], entry[3], entry[4]
+        return None
+
+    def store(self, key, depth, flag, score, move=NOMOVE):
+        slot = (key & self.__mask) * 2
+        old = self.__read(slot)
+        if old is None or old[0] == key or depth >= old[1] or old[5] != self.__generation:
+            i = slot
+            if old is not None and old[0] != key:
+                self.__write(slot + 1, *old)
+        else:
+            i = slot + 1
+        if move == NOMOVE:
+            entry = self.__read(i)
+            if entry is not None and entry[0] == key:
+                move = entry[4]
+        self.__write(i, key, depth, flag, score, move, self.__generation)
@@ -0,0 +1,87 @@
+# tuner.py
+# Author: Elise Raxhon & Julien Beard
+# Version: October 18, 2026
+# -*- coding: utf-8 -*-
+
+from array import array
+import argparse
+
+import numpy as np
+
+import evaluation
+import records
+
+# Evaluation difference giving odds of e (about 73% of winning) to the player ahead
+SCALE = 100.0
+# Strength of the pull of the weights towards the initial ones
+REGULARIZATION = 1e-4
+
+
+def dataset(paths):
+    """Returns the feature matrix (one row per position) and the results for the player to play of the positions
+    of the games recorded in 'paths' (logs or outputs of verbose clients, see records.load). Unfinished games
+    are skipped."""
+    # Compact arrays rather than lists of tuples, there can be millions of positions
+    rows = array('h')
+    results = array('f')
+    for path in paths:
+        for record in records.load(path):
+            if record['end'] is None:
+                continue
+            for state, move in records.replay(record):
+                rows.extend(evaluation.features(state))
+                results.append(records.result(record, state.turn))
+    features = np.frombuffer(rows, dtype=np.int16).reshape(-1, len(evaluation.FEATURES)).astype(np.float64)
+    return features, np.frombuffer(results, dtype=np.float32).astype(np.float64)
+
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+def loss(weights, features, results):
+    """Cross-entropy between the results and the winning probabilities predicted by the evaluation"""
+    probabilities = np.clip(_sigmoid(features @ weights / SCALE), 1e-12, 1 - 1e-12)
+    return float(-np.mean(results * np.log(probabilities) + (1 - results) * np.log(1 - probabilities)))
+
+
+def fit(features, results, weights, iterations=20, regularization=REGULARIZATION):
+    """Logistic regression of the results on the features by Newton's method, starting from (and pulled
+    towards) the 'weights' vector. Returns the new weights."""
+    initial = np.array(weights, dtype=np.float64)
+    weights = initial.copy()
+    count = len(results)
+    for i in range(iterations):
+        probabilities = _sigmoid(features @ weights / SCALE)
+        gradient = features.T @ (probabilities - results) / (SCALE * count) + regularization * (weights - initial)
+        curvature = probabilities * (1 - probabilities) / (SCALE * SCALE * count)
+        hessian = (features * curvature[:, None]).T @ features + regularization * np.eye(len(weights))
+        step = np.linalg.solve(hessian, gradient)
+        weights -= step
+        if np.abs(step).max() < 1e-6:
+            break
+    return weights
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Tunes the evaluation weights on recorded games')
+    parser.add_argument('paths', nargs='+', help='files written with --log or outputs of verbose clients')
+    parser.add_argument('--weights', help='JSON file of the initial weights (default: the built-in ones)')
+    parser.add_argument('--output', help='JSON file to write the tuned weights to (default: print them)')
+    parser.add_argument('--iterations', help='maximum number of Newton iterations (default: 20)', type=int,
+                        default=20)
+    args = parser.parse_args()
+    initial = evaluation.Evaluation.load(args.weights) if args.weights else evaluation.Evaluation()
+    features, results = dataset(args.paths)
+    if len(results) == 0:
+        parser.error('no finished game in the records')
+    before = np.array([initial.weights[feature] for feature in evaluation.FEATURES], dtype=np.float64)
+    after = fit(features, results, before, args.iterations)
+    print('{} positions, error {:.4f} -> {:.4f}'.format(len(results), loss(before, features, results),
+                                                       loss(after, features, results)))
+    tuned = evaluation.Evaluation({feature: round(float(weight), 2)
+                                   for feature, weight in zip(evaluation.FEATURES, after)})
+    if args.output:
+        tuned.save(args.output)
+    else:
+        print(tuned.weights)